@@ -0,0 +1,171 @@
+"""Benchmark of locating the sections of a full-size album page.
+
+The fixtures in tests/data are trimmed to what the parsers read. Real album
+pages are an order of magnitude larger: several discs in three languages,
+long credit lists, the navigation sidebar and the comment section. This
+builds a page of that size from the album fixture and compares the single
+walk of `Sections` with the document-wide XPath queries it replaced::
+
+    python tests/bench_parse.py
+"""
+
+import pathlib
+import re
+import statistics
+import sys
+import timeit
+
+from lxml import etree
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+
+from vgmdb.album import Album  # noqa: E402
+from vgmdb.sections import Sections  # noqa: E402
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+LANGUAGES = ["English", "Japanese", "Romaji"]
+
+# the queries Album.from_page ran before sections were collected in one walk
+XPATHS = [
+    "/html/head/link[1]",
+    "//*[@id='innermain']/h1",
+    "/html/head/meta[@property='og:image']",
+    "//div[@id='rightfloat']//table",
+    "//div[@id='collapse_credits']//table",
+    "//div[@id='tracklist']/../..",
+    "//div[@id='notes']",
+    "//h3[text()='Album Stats']/../../following-sibling::div[1]/div",
+    "//div[@id='cover_gallery']",
+    "//h3[text()='Related Albums']/../../following-sibling::div[1]/span",
+    "//h1/text()",
+]
+
+
+def _tracklist(discs: int, tracks: int) -> str:
+    nav = "".join(
+        f'<li><a class="link" rel="tl{i}">{language}</a></li>'
+        for i, language in enumerate(LANGUAGES, 1)
+    )
+    spans = []
+    for i, language in enumerate(LANGUAGES, 1):
+        parts = [f'<span id="tl{i}" class="tl">']
+        for disc in range(1, discs + 1):
+            parts.append(f"<span><b>Disc {disc} [SQEX-1000{disc}]</b></span>")
+            parts.append('<table cellpadding="0" cellspacing="0" class="role">')
+            for track in range(1, tracks + 1):
+                parts.append(
+                    '<tr class="rolebit"><td class="smallfont"><span class="label">'
+                    f"{track:02}</span></td>"
+                    '<td class="smallfont" width="100%">'
+                    f"{language} title of disc {disc} track {track}</td>"
+                    '<td class="smallfont"><span class="time">3:20</span></td></tr>'
+                )
+            parts.append("</table>")
+            parts.append('<span class="time">80:00</span><br />')
+        parts.append("</span>")
+        spans.append("\n".join(parts))
+    return (
+        f'<div>\n<div><ul id="tlnav">{nav}</ul></div>\n<div>\n<div id="tracklist">\n'
+        + "\n".join(spans)
+        + "\n</div>\n</div>\n</div>"
+    )
+
+
+def _credits(rows: int) -> str:
+    return "\n".join(
+        f'<tr><td><span class="label"><b><span class="artistname" lang="en">'
+        f"Role {i}</span></b></span></td><td>"
+        f'<a href="/artist/{1000 + i}"><span class="artistname" lang="en">'
+        f"Artist {i}</span></a></td></tr>"
+        for i in range(rows)
+    )
+
+
+def _sidebar(links: int) -> str:
+    items = "\n".join(
+        f'<li><a href="/db/marketplace.php?do=browse&amp;page={i}">Menu entry {i}</a></li>'
+        for i in range(links)
+    )
+    return f'<div id="navmember"><div class="menu"><ul>\n{items}\n</ul></div></div>'
+
+
+def _comments(count: int) -> str:
+    comments = "\n".join(
+        f'<div class="comment" id="comment{i}"><div class="commentheader">'
+        f'<a href="/forums/member.php?u={i}">member{i}</a> '
+        f'<span class="smallfont">Jan 1, 2020</span></div>'
+        f'<div class="commentbody"><span>'
+        + "A comment about the soundtrack and its arrangements. " * 6
+        + "</span></div></div>"
+        for i in range(count)
+    )
+    return (
+        '<div id="comments"><div><div><h3>Comments</h3></div></div>\n'
+        f"{comments}\n</div>"
+    )
+
+
+def full_size_album(
+    discs: int = 4,
+    tracks: int = 25,
+    credits: int = 40,
+    links: int = 150,
+    comments: int = 80,
+) -> bytes:
+    """Build an album page of the size of a real one from the album fixture.
+
+    Args:
+        discs (int, optional): Discs in the tracklist. Defaults to 4.
+        tracks (int, optional): Tracks per disc. Defaults to 25.
+        credits (int, optional): Extra credit rows. Defaults to 40.
+        links (int, optional): Links in the navigation sidebar. Defaults to 150.
+        comments (int, optional): Comments below the album. Defaults to 80.
+
+    Returns:
+        bytes: The page.
+    """
+    page = (DATA / "album.html").read_text(encoding="utf-8")
+    page = re.sub(
+        r"<div>\n<div><ul id=\"tlnav\">.*?</div>\n</div>\n</div>",
+        lambda _: _tracklist(discs, tracks),
+        page,
+        count=1,
+        flags=re.S,
+    )
+    page = page.replace(
+        "</table>\n</div>\n<div>", f"{_credits(credits)}\n</table>\n</div>\n<div>", 1
+    )
+    page = page.replace(
+        '<div id="innermain">', f'{_sidebar(links)}\n<div id="innermain">', 1
+    )
+    page = page.replace("</body>", f"{_comments(comments)}\n</body>", 1)
+    return page.encode("utf-8")
+
+
+def parse(content: bytes) -> etree._Element:
+    return etree.HTML(content, etree.HTMLParser())
+
+
+def bench(function, number: int = 200, repeat: int = 7) -> float:
+    """Get the median time of one call in milliseconds."""
+    times = timeit.repeat(function, number=number, repeat=repeat)
+    return statistics.median(times) / number * 1000
+
+
+def main() -> None:
+    content = full_size_album()
+    page = parse(content)
+    print(f"page: {len(content) / 1024:.0f} KB, {sum(1 for _ in page.iter())} elements")
+    xpath = bench(lambda: [page.xpath(query) for query in XPATHS])
+    walk = bench(lambda: Sections(page))
+    print(f"document-wide XPath queries: {xpath:.3f} ms")
+    print(f"Sections walk:               {walk:.3f} ms")
+    print(
+        f"Album.from_page:             {bench(lambda: Album.from_page(page), 20):.3f} ms"
+    )
+    print(f"parse HTML:                  {bench(lambda: parse(content), 20):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
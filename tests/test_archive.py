@@ -0,0 +1,109 @@
+import json
+import pathlib
+
+import pytest
+
+from vgmdb.cli import main
+from vgmdb.utils import Link, VGMdbType, to_dict
+
+pytest.importorskip("zstandard")
+
+from vgmdb.archive import Archive, ArchiveWriter, reparse  # noqa: E402
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+
+def album_pages(count):
+    page = (DATA / "album.html").read_bytes()
+    for id in range(1, count + 1):
+        yield Link(VGMdbType.Album, id), page.replace(b"album/79", b"album/%d" % id)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "pages.vgma"
+    with ArchiveWriter(path, samples=50) as writer:
+        for link, content in album_pages(80):
+            writer.add(link, content)
+        for type in ("artist", "org", "product", "event"):
+            content = (DATA / f"{type}.html").read_bytes()
+            url = Link(VGMdbType.from_str(type), 1).full_url()
+            assert writer.add_page(url, content)
+        assert not writer.add_page("https://vgmdb.net/search?q=x", b"")
+    return path
+
+
+def test_random_access(archive):
+    with Archive(archive) as pages:
+        assert len(pages) == 84
+        assert pages.dictionary
+        link, content = list(album_pages(42))[-1]
+        assert link in pages
+        assert pages.get(link) == content
+        assert pages.get(Link(VGMdbType.Album, 81)) is None
+        assert pages.parse(Link(VGMdbType.Artist, 1)).name.en
+        album = pages.parse(link)
+        assert album.link.id == 42
+    raw = sum(len(content) for _, content in album_pages(80))
+    assert archive.stat().st_size < raw / 10
+
+
+def test_not_an_archive(tmp_path):
+    path = tmp_path / "pages.vgma"
+    path.write_bytes(b"<html></html>" * 10)
+    with pytest.raises(ValueError):
+        Archive(path)
+
+
+def test_failed_write_leaves_no_file(tmp_path, monkeypatch):
+    path = tmp_path / "pages.vgma"
+    writer = ArchiveWriter(path, samples=50)
+    with pytest.raises(ValueError):
+        writer.add(Link(VGMdbType.Album, -1), b"")
+
+    def fail(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.fsync", fail)
+    with pytest.raises(OSError):
+        writer.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reparse(archive):
+    results = list(reparse(archive, workers=2, chunk_size=16))
+    assert len(results) == 84
+    assert [link.id for link, _, _ in results[:80]] == list(range(1, 81))
+    assert all(obj is not None and error is None for _, obj, error in results)
+    assert to_dict(results[79][1].tracklist) == to_dict(results[0][1].tracklist)
+
+
+def test_reparse_bad_page(tmp_path, capsys):
+    path = tmp_path / "pages.vgma"
+    with ArchiveWriter(path, samples=50) as writer:
+        for link, content in album_pages(9):
+            if link.id == 3:
+                content = content.replace(b"Disc 1 [", b"Side A [")
+            writer.add(link, content)
+    results = list(reparse(path, workers=2, chunk_size=4))
+    assert [link.id for link, _, _ in results] == list(range(1, 10))
+    assert [link.id for link, obj, _ in results if obj] == [1, 2, 4, 5, 6, 7, 8, 9]
+    assert results[2][2].startswith("ValueError: Unknown title")
+    output = tmp_path / "out.jsonl"
+    assert main(["reparse", str(path), "-j", "2", "-q", "-o", str(output)]) == 1
+    assert len(output.read_text().splitlines()) == 8
+    assert "album/3: ValueError" in capsys.readouterr().err
+
+
+def test_reparse_command(archive, tmp_path):
+    output = tmp_path / "out.jsonl"
+    assert main(["reparse", str(archive), "-j", "2", "-q", "-o", str(output)]) == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 84
+    assert {i["type"] for i in records} == {
+        "album",
+        "artist",
+        "org",
+        "product",
+        "event",
+    }
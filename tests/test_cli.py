@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from vgmdb import VGMdb
+from vgmdb.album import Album
+from vgmdb.cli import main, parse_ids
+from vgmdb.utils import Name, Picture, VGMdbType
+
+
+def test_parse_ids():
+    assert list(parse_ids(["1-3", "7,9", "11 12"])) == [1, 2, 3, 7, 9, 11, 12]
+    for value in ["1-", "a", "-3", "5-3", "1-2-3"]:
+        with pytest.raises(ValueError):
+            list(parse_ids([value]))
+
+
+@pytest.mark.parametrize(
+    "argv, message",
+    [
+        (["fetch", "1-"], "invalid ID or range"),
+        (["covers", "5-3"], "range ends before it starts"),
+        (["crawl", "leases.db", "--range", "a-b"], "invalid ID or range"),
+        (["crawl", "leases.db", "--range", "9-1"], "range ends before it starts"),
+    ],
+)
+def test_invalid_ids(argv, message, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_invalid_ids_in_file(tmp_path, capsys):
+    ids = tmp_path / "ids.txt"
+    ids.write_text("1\n2-x\n")
+    with pytest.raises(SystemExit):
+        main(["fetch", "-f", str(ids)])
+    assert "invalid ID or range: '2-x'" in capsys.readouterr().err
+
+
+def test_fetch(monkeypatch, tmp_path, capsys):
+    def get(id, type, timeout=None):
+        if id == 3:
+            return None
+        if id == 4:
+            raise ValueError("broken page")
+        return Album(id, Name("Album", "アルバム"))
+
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(get))
+    ids = tmp_path / "ids.txt"
+    ids.write_text("1-2\n# comment\n3\n4\n")
+    output = tmp_path / "out.jsonl"
+    status = main(
+        ["fetch", "-f", str(ids), "-j", "2", "--rate", "0", "-o", str(output)]
+    )
+    assert status == 1
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(i["id"] for i in records) == [1, 2]
+    assert records[0]["name"]["ja"] == "アルバム"
+    assert "album/4: broken page" in capsys.readouterr().err
+
+
+def test_crawl(monkeypatch, tmp_path):
+    def get(id, type, timeout=None):
+        return Album(id, Name("Album")) if id % 2 else None
+
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(get))
+    store = str(tmp_path / "leases.db")
+    output = tmp_path / "out.jsonl"
+    args = ["crawl", store, "-j", "3", "--rate", "0", "-q", "-o", str(output)]
+    assert main(args + ["--range", "1-50", "--lease-size", "7"]) == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(i["id"] for i in records) == list(range(1, 51, 2))
+    # a second run finds every lease done
+    assert main(args) == 0
+    assert output.read_text() == ""
+
+
+def test_covers_download(monkeypatch, tmp_path):
+    def get(id, type, timeout=None):
+        album = Album(id, Name("Album"))
+        album.covers = {"Front": Picture(VGMdbType.Album, id, "front")}
+        return album
+
+    timeouts = []
+
+    def download(url, timeout=None):
+        timeouts.append(VGMdb.timeout if timeout is None else timeout)
+        return b"cover"
+
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(get))
+    monkeypatch.setattr(VGMdb, "download", staticmethod(download))
+    monkeypatch.setattr(VGMdb, "timeout", VGMdb.timeout)
+    output = tmp_path / "out.jsonl"
+    args = ["covers", "7", "-d", str(tmp_path), "--timeout", "5", "-q"]
+    assert main(args + ["--rate", "0", "-o", str(output)]) == 0
+    assert (tmp_path / "7" / "Front.jpg").read_bytes() == b"cover"
+    assert timeouts == [5.0]
+
+
+def test_rate_limits_scheduler(monkeypatch, tmp_path):
+    schedulers = []
+
+    def get(id, type, timeout=None):
+        schedulers.append(VGMdb.scheduler)
+        return Album(id, Name("Album"))
+
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(get))
+    output = str(tmp_path / "out.jsonl")
+    args = ["fetch", "1-3", "--rate", "5", "--burst", "3", "-q", "-o", output]
+    assert main(args) == 0
+    # every request goes through the one scheduler main installed
+    assert len(set(map(id, schedulers))) == 1
+    assert schedulers[0].limiter.rate == 5 and schedulers[0].limiter.burst == 3
+    assert VGMdb.scheduler is None
+
+
+def test_invalid_cookie(capsys):
+    with pytest.raises(SystemExit):
+        main(["fetch", "1", "--cookie", "session"])
+    assert "expected KEY=VALUE" in capsys.readouterr().err
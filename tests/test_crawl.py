@@ -0,0 +1,110 @@
+import functools
+import os
+import time
+
+import pytest
+
+from vgmdb.crawl import CrawlWorker, FileLeaseStore, SQLiteLeaseStore, run_workers
+from vgmdb.utils import VGMdbType
+
+
+def fetch(id):
+    time.sleep(0.001)
+    return None
+
+
+def record(path, id, obj):
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()} {id}\n")
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteLeaseStore(tmp_path / "leases.db")
+    return FileLeaseStore(tmp_path / "leases.json")
+
+
+def test_processes_crawl_every_id_once(store, tmp_path):
+    assert store.create(VGMdbType.Album, 1, 301, 10) == 30
+    assert store.create(VGMdbType.Album, 1, 301, 10) == 0
+    path = tmp_path / "ids.txt"
+    count = run_workers(
+        store, VGMdbType.Album, functools.partial(record, path), 4, fetch, ttl=5
+    )
+    lines = [line.split() for line in path.read_text().splitlines()]
+    assert count == 300
+    assert sorted(int(id) for _, id in lines) == list(range(1, 301))
+    assert len({pid for pid, _ in lines}) > 1
+    assert store.status(VGMdbType.Album) == {
+        "pending": 0,
+        "leased": 0,
+        "expired": 0,
+        "done": 30,
+    }
+
+
+def test_expired_lease_is_resumed(store):
+    store.create(VGMdbType.Artist, 1, 11, 10)
+    dead = store.claim(VGMdbType.Artist, "dead", ttl=0.05)
+    assert store.heartbeat(dead, 4, ttl=0.05)
+    assert store.claim(VGMdbType.Artist, "other", ttl=5) is None
+    time.sleep(0.1)
+    assert store.status(VGMdbType.Artist)["expired"] == 1
+
+    seen = []
+    worker = CrawlWorker(
+        store, VGMdbType.Artist, lambda id, obj: seen.append(id), fetch, ttl=5
+    )
+    assert worker.run() == 7
+    assert seen == list(range(4, 11))
+    # the previous owner was fenced off
+    assert not store.heartbeat(dead, 5, ttl=5)
+    assert not store.release(dead)
+    assert store.status(VGMdbType.Artist)["done"] == 1
+
+
+def test_failing_id_is_skipped(store):
+    store.create(VGMdbType.Album, 1, 21, 10)
+    attempts = []
+
+    def broken_fetch(id):
+        attempts.append(id)
+        if id == 5:
+            raise ValueError("Unknown title")
+        return None
+
+    seen, errors = [], []
+    worker = CrawlWorker(
+        store,
+        VGMdbType.Album,
+        lambda id, obj: seen.append(id),
+        broken_fetch,
+        ttl=5,
+        error=lambda id, e: errors.append((id, str(e))),
+    )
+    assert worker.run() == 20
+    assert seen == [i for i in range(1, 21) if i != 5]
+    assert errors == [(5, "Unknown title")]
+    assert attempts.count(5) == 3
+    assert worker.failed == 1
+    assert store.status(VGMdbType.Album)["done"] == 2
+
+
+def test_lost_lease_is_abandoned(store):
+    store.create(VGMdbType.Org, 1, 101, 100)
+
+    def slow_fetch(id):
+        time.sleep(0.02)
+        return None
+
+    seen = []
+    worker = CrawlWorker(
+        store, VGMdbType.Org, lambda id, obj: seen.append(id), slow_fetch, 0.3
+    )
+    lease = store.claim(VGMdbType.Org, worker.owner, ttl=0)
+    # another worker takes over, e.g. after the first one was partitioned
+    assert store.claim(VGMdbType.Org, "other", ttl=5).owner == "other"
+    assert not worker.work(lease)
+    assert 0 < len(seen) < 100
+    assert store.status(VGMdbType.Org)["leased"] == 1
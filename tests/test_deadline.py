@@ -0,0 +1,139 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+from vgmdb import VGMdb
+from vgmdb.deadline import Deadline, DeadlineExceeded, Hedger
+
+
+def test_hedge_wins():
+    hedger = Hedger(delay=0.05)
+    calls = []
+
+    def attempt(deadline):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            time.sleep(1)
+            return "slow"
+        return "fast"
+
+    assert hedger.run(attempt, Deadline(5)) == "fast"
+    assert len(calls) == 2
+    assert hedger.stats.to_dict()["hedge_wins"] == 1
+
+
+def test_no_hedge_when_fast():
+    hedger = Hedger(delay=0.5)
+    assert hedger.run(lambda deadline: "ok", Deadline(5)) == "ok"
+    assert hedger.stats.hedges == 0
+
+
+def test_hedged_deadline():
+    hedger = Hedger(delay=0.05)
+    with pytest.raises(DeadlineExceeded):
+        hedger.run(lambda deadline: time.sleep(1), Deadline(0.2))
+    assert hedger.stats.to_dict()["deadlines_exceeded"] == 1
+
+
+def test_hedging_does_not_cap_concurrency():
+    hedger = Hedger(delay=0.1)
+
+    def attempt(deadline):
+        time.sleep(0.3)
+        return "ok"
+
+    threads = [
+        threading.Thread(target=hedger.run, args=(attempt, Deadline(5)))
+        for _ in range(64)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 64 requests and their 64 hedges all run at once
+    assert time.monotonic() - started < 0.5
+    assert hedger.stats.hedges == 64
+
+
+def test_error_before_hedge():
+    hedger = Hedger(delay=1)
+
+    def attempt(deadline):
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError):
+        hedger.run(attempt, Deadline(5))
+    assert hedger.stats.hedges == 0
+
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        for _ in range(20):
+            self.wfile.write(b"<p>" + b"x" * 1024 + b"</p>")
+            self.wfile.flush()
+            time.sleep(0.1)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fetch_page_deadline():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/album/1"
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            VGMdb.fetch_page(url, Deadline(0.5))
+        assert time.monotonic() - started < 1.5
+    finally:
+        server.shutdown()
+
+
+class StalledBodyHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(0.8)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", "100000")
+        self.end_headers()
+        self.wfile.write(b"<html><body>")
+        self.wfile.flush()
+        time.sleep(3)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fetch_page_stalled_body():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StalledBodyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/album/1"
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            VGMdb.fetch_page(url, Deadline(1.0))
+        assert time.monotonic() - started < 1.3
+    finally:
+        server.shutdown()
+
+
+def test_download_stalled_body():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StalledBodyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/cover.jpg"
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            VGMdb.download(url, 1.0)
+        assert time.monotonic() - started < 1.3
+    finally:
+        server.shutdown()
@@ -0,0 +1,57 @@
+import datetime
+
+import pytest
+
+from vgmdb.album import Album
+from vgmdb.artist import Artist
+from vgmdb.utils import Name, Track, Tracklist
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from vgmdb import export  # noqa: E402
+
+
+def make_album(id: int) -> Album:
+    album = Album(id, Name("Album", "アルバム"))
+    album.catalog = f"CAT-{id}"
+    album.category = Album.Category.Game
+    album.release_date = datetime.date(2000, 1, 2)
+    album.media_format = "CD"
+    disc = Tracklist(1, album.catalog, "CD")
+    disc.length = datetime.timedelta(seconds=200)
+    track = Track(1)
+    track.title = Name("Track")
+    track.length = datetime.timedelta(seconds=200)
+    subtrack = Track(1)
+    subtrack.title = Name("Part")
+    track.subtracks = [subtrack]
+    disc.tracks = [track]
+    album.tracklist = [disc]
+    composer = Artist(10, Name("Composer"))
+    composer.role = "composer"
+    album.composer = [composer, Artist(-1, "Unlinked")]
+    return album
+
+
+def test_iter_batches():
+    batches = list(export.iter_batches((make_album(i) for i in range(5)), 2))
+    assert [len(b["albums"]) for b in batches] == [2, 2, 1]
+    albums = batches[0]["albums"].to_pydict()
+    assert albums["release_date"][0] == datetime.date(2000, 1, 2)
+    assert albums["length"] == [200, 200]
+    assert batches[0]["albums"].column("category").type == pa.dictionary(
+        pa.int32(), pa.string()
+    )
+    tracks = batches[0]["tracks"].to_pydict()
+    assert tracks["index"] == [1, 1, 1, 1]
+    assert tracks["subindex"] == [None, 1, None, 1]
+    credits = batches[0]["credits"].to_pydict()
+    assert credits["artist_id"] == [10, None, 10, None]
+
+
+def test_write_parquet(tmp_path):
+    paths = export.write_parquet((make_album(i) for i in range(5)), tmp_path, 2)
+    assert pq.read_table(paths["albums"]).num_rows == 5
+    assert pq.read_table(paths["discs"]).num_rows == 5
+    assert pq.read_table(paths["tracks"]).num_rows == 10
@@ -0,0 +1,57 @@
+import http.server
+import pathlib
+import threading
+import time
+
+import pytest
+
+from vgmdb import VGMdb
+from vgmdb.archive import parse_html
+from vgmdb.utils import VGMdbType
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+PAGES = {
+    "/album/79": ("text/html", (DATA / "album.html").read_bytes()),
+    "/sjis": (
+        "text/html; charset=Shift_JIS",
+        "<html><body><h1>ファイナルファンタジー</h1></body></html>".encode("shift_jis"),
+    ),
+}
+
+
+class ChunkedHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for i in range(0, len(body), 4096):
+            self.wfile.write(body[i : i + 4096])
+            self.wfile.flush()
+            time.sleep(0.001)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ChunkedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_streamed_page_matches_buffered(server):
+    page = VGMdb.fetch_page(f"{server}/album/79")
+    streamed = VGMdb.parse_page(page, VGMdbType.Album)
+    buffered = VGMdb.parse_page(parse_html(PAGES["/album/79"][1]), VGMdbType.Album)
+    assert streamed.to_dict() == buffered.to_dict()
+    assert streamed.name.ja
+
+
+def test_declared_encoding(server):
+    page = VGMdb.fetch_page(f"{server}/sjis")
+    assert page.findtext(".//h1") == "ファイナルファンタジー"
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+# Budget for `import vgmdb` in microseconds, well above a cold import of the
+# type modules but far below what requests and lxml cost.
+IMPORT_BUDGET = 100_000
+
+
+def importtime(code: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_is_lazy():
+    modules = importtime("import vgmdb; from vgmdb.utils import Link, Picture")
+    assert "requests" not in modules
+    assert "lxml" not in modules
+    assert modules["vgmdb"] < IMPORT_BUDGET
+
+
+def test_client_loads_on_first_use():
+    modules = importtime("import vgmdb; vgmdb.VGMdb")
+    assert "vgmdb.client" in modules
+    assert "requests" in modules
@@ -0,0 +1,83 @@
+from vgmdb.album import Album
+from vgmdb.artist import Artist
+from vgmdb.index import MAX_EXPANSIONS, NameIndex, tokenize
+from vgmdb.org import Org
+from vgmdb.utils import Name, VGMdbType
+
+
+def make_index() -> NameIndex:
+    index = NameIndex()
+    album = Album(
+        1, Name("Final Fantasy VII Original Soundtrack", "ファイナルファンタジーVII")
+    )
+    album.catalog = "SQEX-10001~4"
+    composer = Artist(77, Name("Nobuo Uematsu", "植松伸夫"))
+    composer.aliases = ["NOBUO"]
+    album.composer = [composer, Artist(-1, "Unknown")]
+    index.add_album(album)
+    org = Org(5, Name("Square Enix Music"))
+    org.aliases = ["SQEX"]
+    index.add(org)
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Ｆｉｎａｌ Fantásy") == ["final", "fantasy"]
+    assert tokenize("植松伸夫") == ["植松", "松伸", "伸夫"]
+    assert tokenize("植松伸夫", tails=True) == ["植松", "松伸", "伸夫", "夫"]
+
+
+def test_search():
+    index = make_index()
+    assert len(index) == 3
+    assert [i.id for i in index.search("uematsu")] == [77]
+    assert [i.id for i in index.search("植松")] == [77]
+    assert [i.id for i in index.search("植")] == [77]
+    assert [i.id for i in index.search("夫")] == [77]
+    assert [i.id for i in index.search("ジ")] == [1]
+    assert [i.id for i in index.search("ファンタジー")] == [1]
+    assert [i.id for i in index.search("final fant")] == [1]
+    assert [i.id for i in index.search("SQEX10001")] == [1]
+    assert [i.id for i in index.search("sqex", VGMdbType.Org)] == [5]
+    result = index.search("nobuo uematsu")[0]
+    assert isinstance(result, Artist) and result.aliases == ["NOBUO"]
+    result.name.en = "changed"
+    assert index.search("nobuo uematsu")[0].name.en == "Nobuo Uematsu"
+
+
+def test_replace():
+    index = make_index()
+    index.add(Artist(77, Name("Someone Else")))
+    assert index.search("uematsu") == []
+    assert [i.id for i in index.search("someone")] == [77]
+
+
+def test_references_do_not_replace():
+    index = make_index()
+    album = Album(2, Name("Another Album"))
+    album.composer = [Artist(77, Name("N. Uematsu"))]
+    index.add_album(album)
+    assert [i.id for i in index.search("nobuo")] == [77]
+
+
+def test_terms_stay_sorted():
+    index = NameIndex()
+    for id in range(3000):
+        index.add(Album(id, Name(f"album{id:04} x{id % 7}")))
+    for id in range(0, 3000, 2):
+        index.remove(Album(id))
+    terms = index.terms + index.recent
+    assert sorted(terms) == sorted(index.postings)
+    assert index.terms == sorted(index.terms)
+    assert index.recent == sorted(index.recent)
+    assert [i.id for i in index.search("album2999")] == [2999]
+    # single letters only match whole words, prefixes are capped
+    assert index.search("a") == []
+    assert len(index._expand("album")) == MAX_EXPANSIONS
+    assert [i.id for i in index.search("album299", limit=None)] == [
+        2991,
+        2993,
+        2995,
+        2997,
+        2999,
+    ]
@@ -0,0 +1,85 @@
+import json
+import pathlib
+
+from vgmdb import VGMdb
+from vgmdb.loadtest import (
+    Profile,
+    StandInServer,
+    load_pages,
+    load_search_page,
+    main,
+    percentile,
+    run,
+    scenario,
+)
+from vgmdb.utils import VGMdbType
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values[:1], 95) == 1
+    assert percentile([], 50) is None
+
+
+def test_run(monkeypatch):
+    pages = load_pages(DATA)
+    assert set(pages) == set(VGMdbType)
+    with StandInServer(pages, Profile(latency=0.005)) as server:
+        monkeypatch.setattr(VGMdb, "base_url", server.url)
+        result = run(scenario("get", range(1, 100)), 4, 0.5, 0.1, server)
+    assert result["requests"] > 10
+    assert not result["errors"]
+    latency = result["latency"]
+    assert 0.005 <= latency["p50"] <= latency["p95"] <= latency["p99"]
+    assert 1 <= result["connections"] <= 4
+    assert len(result["samples"]) >= 5
+    assert result["samples"][-1]["requests"] == result["requests"]
+
+
+def test_search(monkeypatch):
+    search_page = load_search_page(DATA)
+    with StandInServer(load_pages(DATA), Profile(), search_page) as server:
+        monkeypatch.setattr(VGMdb, "base_url", server.url)
+        assert len(scenario("search", [1])()) == 48
+
+
+def test_bulk_scenarios(monkeypatch):
+    with StandInServer(load_pages(DATA), Profile()) as server:
+        monkeypatch.setattr(VGMdb, "base_url", server.url)
+        # every album ID is served the saved page of album 79
+        records = scenario("fetch", [1, 2])()
+        assert json.loads(records[0])["id"] == 79
+        assert scenario("crawl", [3])().id == 79
+
+
+def test_errors(monkeypatch):
+    search_page = load_search_page(DATA)
+    with StandInServer(
+        load_pages(DATA), Profile(error_rate=1.0), search_page
+    ) as server:
+        monkeypatch.setattr(VGMdb, "base_url", server.url)
+        result = run(scenario("search", range(1, 100)), 2, 0.2, 0.1, server)
+    assert result["requests"] == 0
+    assert result["errors"]["HTTPError"] > 0
+
+
+def test_report(tmp_path):
+    output = tmp_path / "report.json"
+    argv = ["--pages", str(DATA), "--concurrency", "1,2", "--duration", "0.2"]
+    argv += ["--scenario", "search", "--scenario", "fetch"]
+    assert main(argv + ["--bandwidth", "1000000", "-o", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["profile"]["bandwidth"] == 1000000
+    assert set(report["client"]) == {"version", "commit"}
+    assert [(i["scenario"], i["concurrency"]) for i in report["runs"]] == [
+        ("search", 1),
+        ("search", 2),
+        ("fetch", 1),
+        ("fetch", 2),
+    ]
+    assert not any(i["errors"] for i in report["runs"])
+    assert VGMdb.base_url == "https://vgmdb.net"
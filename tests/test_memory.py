@@ -0,0 +1,60 @@
+import gc
+import os
+import pathlib
+
+import pytest
+from lxml import etree
+
+from vgmdb import VGMdb
+from vgmdb.utils import VGMdbType
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+# A retained album costs ~10 KB, one pinning its document costs ~150 KB.
+MAX_GROWTH_PER_PAGE = 40_000
+
+
+def rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def lxml_values(value, seen=None) -> list:
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return []
+    seen.add(id(value))
+    if type(value).__module__.startswith("lxml"):
+        return [value]
+    if isinstance(value, dict):
+        values = list(value.keys()) + list(value.values())
+    elif isinstance(value, (list, tuple, set)):
+        values = list(value)
+    elif hasattr(value, "__dict__"):
+        values = list(vars(value).values())
+    else:
+        return []
+    return [i for v in values for i in lxml_values(v, seen)]
+
+
+@pytest.mark.parametrize("type", list(VGMdbType))
+def test_no_lxml_values(type):
+    data = (DATA / f"{type}.html").read_bytes()
+    obj = VGMdb.parse_page(etree.HTML(data, etree.HTMLParser()), type)
+    assert lxml_values(obj) == []
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_parsed_objects_do_not_pin_documents():
+    data = (DATA / "album.html").read_bytes()
+
+    def parse():
+        page = etree.HTML(data, etree.HTMLParser())
+        return VGMdb.parse_page(page, VGMdbType.Album)
+
+    cache = [parse() for _ in range(200)]
+    gc.collect()
+    before = rss()
+    cache += [parse() for _ in range(3000)]
+    gc.collect()
+    assert (rss() - before) / 3000 < MAX_GROWTH_PER_PAGE
@@ -0,0 +1,106 @@
+import datetime
+import pathlib
+
+from lxml import etree
+
+from vgmdb import VGMdb
+from vgmdb.album import Album
+from vgmdb.artist import Artist
+from vgmdb.event import Event
+from vgmdb.org import Org
+from vgmdb.product import Product
+from vgmdb.sections import Sections
+from vgmdb.utils import VGMdbType
+
+from bench_parse import XPATHS, full_size_album, parse
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+
+def load(name: str) -> etree._Element:
+    return etree.HTML((DATA / f"{name}.html").read_bytes(), etree.HTMLParser())
+
+
+def test_sections():
+    sections = Sections(load("album"))
+    assert sections.link.get("href").endswith("/album/79")
+    assert sections.title.getparent().get("id") == "innermain"
+    assert sections.heading("Album Stats").find("div").get("class") == "smallfont"
+    assert sections.find("collapse_credits", "table") is not None
+    assert not sections.is_error()
+
+
+def test_full_size_page():
+    page = parse(full_size_album())
+    sections = Sections(page)
+    assert sections.link is page.xpath(XPATHS[0])[0]
+    assert sections.title is page.xpath(XPATHS[1])[0]
+    assert sections.find("collapse_credits", "table") is page.xpath(XPATHS[4])[0]
+    assert sections.heading("Related Albums").find("span") is page.xpath(XPATHS[9])[0]
+    album = Album.from_page(page, sections)
+    assert [len(disc.tracks) for disc in album.tracklist] == [25] * 4
+    assert album.tracklist[3].tracks[24].title.ja_latn.startswith("Romaji")
+
+
+def test_album():
+    album = VGMdb.parse_page(load("album"), VGMdbType.Album)
+    assert isinstance(album, Album)
+    assert album.id == 79
+    assert album.name.ja == "ファイナルファンタジーVII オリジナル・サウンドトラック"
+    assert album.catalog == "SQEX-10001~4"
+    assert album.release_date == datetime.date(2004, 5, 10)
+    assert album.price == (3990, "JPY")
+    assert [i.id for i in album.label] == [42]
+    assert [i.id for i in album.arranger] == [77, 78]
+    assert album.category == Album.Category.Game
+    assert [len(i.tracks) for i in album.tracklist] == [3, 2]
+    assert album.tracklist[0].tracks[1].subtracks[0].title.ja == "オープニング"
+    assert album.tracklist[1].type == "Bonus CD"
+    assert list(album.covers) == ["Front", "Back"]
+    assert [i.id for i in album.related_albums] == [80]
+
+
+def test_artist():
+    artist = VGMdb.parse_page(load("artist"), VGMdbType.Artist)
+    assert isinstance(artist, Artist)
+    assert artist.id == 77
+    assert artist.name.ja == "植松伸夫"
+    assert artist.birthdate == datetime.date(1959, 3, 21)
+    assert artist.aliases == ["NOBUO UEMATSU", "N. Uematsu", "Uematsu Nobuo"]
+    assert artist.info["Gender"] == "Male"
+    assert [i.id for i in artist.albums] == [79, 80]
+    assert artist.albums[0].category == Album.Category.Game
+    assert artist.picture.id == 77
+    assert artist.notes == "Composer of the FINAL FANTASY series."
+
+
+def test_org():
+    org = VGMdb.parse_page(load("org"), VGMdbType.Org)
+    assert isinstance(org, Org)
+    assert org.name.en == "SQUARE ENIX Music"
+    assert org.region == "Japan"
+    assert org.aliases == ["DigiCube", "SQEX"]
+    assert org.picture is None
+    assert [i.id for i in org.albums] == [79]
+
+
+def test_product():
+    product = VGMdb.parse_page(load("product"), VGMdbType.Product)
+    assert isinstance(product, Product)
+    assert product.release_date == datetime.date(1997, 1, 31)
+    assert product.info["Platforms"] == "PlayStation"
+    assert [i.id for i in product.albums] == [79]
+
+
+def test_event():
+    event = VGMdb.parse_page(load("event"), VGMdbType.Event)
+    assert isinstance(event, Event)
+    assert event.name.ja == "コミックマーケット100"
+    assert event.start_date == datetime.date(2022, 8, 13)
+    assert event.end_date == datetime.date(2022, 8, 14)
+    assert event.albums[0].category == Album.Category.Doujin_Indie
+
+
+def test_error_page():
+    page = etree.HTML("<html><body><h1>System Message</h1></body></html>")
+    assert VGMdb.parse_page(page, VGMdbType.Album) is None
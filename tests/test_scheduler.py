@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from vgmdb import VGMdb, VGMdbType
+from vgmdb.deadline import Deadline, DeadlineExceeded
+from vgmdb.scheduler import (
+    BULK,
+    INTERACTIVE,
+    RequestClass,
+    Scheduler,
+    current_priority,
+    priority,
+)
+
+
+def send_all(scheduler, names, order=None):
+    order = [] if order is None else order
+    lock = threading.Lock()
+
+    def send(name):
+        with scheduler.slot(name):
+            with lock:
+                order.append(name)
+
+    threads = [threading.Thread(target=send, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    return threads, order
+
+
+def test_interactive_preempts_bulk():
+    scheduler = Scheduler(rate=50)
+    threads, order = send_all(scheduler, [BULK] * 20)
+    time.sleep(0.05)
+    more, _ = send_all(scheduler, [INTERACTIVE], order)
+    for thread in threads + more:
+        thread.join()
+    # queued behind at most the bulk requests sent while it was starting
+    assert order.index(INTERACTIVE) <= 5
+    assert scheduler.stats()[BULK]["sent"] == 20
+
+
+def test_weighted_fair_share():
+    scheduler = Scheduler(
+        rate=50, classes=[RequestClass("a", weight=3), RequestClass("b", weight=1)]
+    )
+    scheduler.limiter.tokens = 0  # queue everything before the first token
+    threads, order = send_all(scheduler, ["a", "b"] * 20)
+    for thread in threads:
+        thread.join()
+    assert 12 <= order[:20].count("a") <= 17
+
+
+def test_concurrency_cap():
+    scheduler = Scheduler(rate=0, classes=[RequestClass("bulk", concurrency=2)])
+    running = []
+    peak = []
+
+    def send():
+        with scheduler.slot("bulk"):
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.02)
+            running.pop()
+
+    threads = [threading.Thread(target=send) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 2
+
+
+def test_deadline_while_queued():
+    scheduler = Scheduler(rate=1)
+    scheduler.limiter.tokens = 0
+    with pytest.raises(DeadlineExceeded):
+        scheduler.acquire(INTERACTIVE, Deadline(0.05))
+    assert scheduler.stats()[INTERACTIVE] == {"queued": 0, "running": 0, "sent": 0}
+
+
+def test_client_priority(monkeypatch):
+    calls = []
+
+    def fetch_page(url, deadline=None, priority=None):
+        calls.append(priority)
+        raise ValueError("offline")
+
+    monkeypatch.setattr(VGMdb, "fetch_page", staticmethod(fetch_page))
+    with priority(BULK), pytest.raises(ValueError):
+        VGMdb.get(1, VGMdbType.Album)
+    with pytest.raises(ValueError):
+        VGMdb.search("Final Fantasy")
+    assert calls == [BULK, INTERACTIVE]
+
+
+def test_interactive_does_not_join_bulk_call(monkeypatch):
+    calls = []
+    started = threading.Event()
+
+    def get(id, type, timeout=None):
+        calls.append(current_priority())
+        if current_priority() == BULK:
+            started.set()
+            time.sleep(0.5)
+        return None
+
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(get))
+
+    def bulk():
+        with priority(BULK):
+            VGMdb.get(1, VGMdbType.Album)
+
+    thread = threading.Thread(target=bulk)
+    thread.start()
+    started.wait()
+    sent = time.monotonic()
+    VGMdb.get(1, VGMdbType.Album)
+    assert time.monotonic() - sent < 0.2
+    thread.join()
+    assert calls == [BULK, INTERACTIVE]
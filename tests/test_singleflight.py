@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+from vgmdb import VGMdb
+from vgmdb.album import Album
+from vgmdb.singleflight import AsyncSingleFlight
+from vgmdb.utils import VGMdbType
+
+
+def fake_get(calls):
+    def _get(id, type, timeout=None):
+        calls.append(id)
+        time.sleep(0.2)
+        return Album(id, "Album")
+
+    return _get
+
+
+def test_get(monkeypatch):
+    calls = []
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(fake_get(calls)))
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(VGMdb.get_album(1)))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert len({id(i) for i in results}) == 10
+    results[0].name.en = "changed"
+    assert all(i.name.en == "Album" for i in results[1:])
+    VGMdb.get(2, VGMdbType.Album)
+    assert calls == [1, 2]
+
+
+def test_get_async(monkeypatch):
+    calls = []
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(fake_get(calls)))
+
+    async def main():
+        return await asyncio.gather(
+            *[VGMdb.get_async(1, VGMdbType.Album) for _ in range(10)]
+        )
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert len({id(i) for i in results}) == 10
+
+
+def test_async_leader_cancelled():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return ["result"]
+
+    async def main():
+        leader = asyncio.create_task(flight.do("k", fetch))
+        follower = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await follower
+        assert leader.cancelled()
+        return result
+
+    assert asyncio.run(main()) == ["result"]
+    assert calls == [1]
+
+
+def test_async_all_cancelled():
+    flight = AsyncSingleFlight()
+    finished = []
+
+    async def fetch():
+        await asyncio.sleep(0.1)
+        finished.append(1)
+
+    async def main():
+        tasks = [asyncio.create_task(flight.do("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.sleep(0.2)
+        assert not flight.calls
+
+    asyncio.run(main())
+    assert finished == []
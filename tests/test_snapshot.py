@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import pathlib
+
+import pytest
+
+from lxml import etree
+
+from vgmdb import VGMdb
+from vgmdb.snapshot import Snapshot, write_snapshot
+from vgmdb.utils import VGMdbType
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+
+def parse(type):
+    page = etree.HTML((DATA / f"{type}.html").read_bytes(), etree.HTMLParser())
+    return VGMdb.parse_page(page, VGMdbType.from_str(type))
+
+
+def objects():
+    return [parse(type) for type in ("album", "artist", "org", "product", "event")]
+
+
+def lookup(path, type, id, queue):
+    with Snapshot(path) as snapshot:
+        queue.put(str(snapshot.get(type, id).name))
+
+
+def test_lookup(tmp_path):
+    path = tmp_path / "objects.snap"
+    assert write_snapshot(objects(), path) == 5
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == 5
+        assert (VGMdbType.Album, 79) in snapshot
+        assert (VGMdbType.Album, 80) not in snapshot
+        assert snapshot.get(VGMdbType.Artist, 79) is None
+        album = snapshot.get(VGMdbType.Album, 79)
+        assert album.to_dict() == parse("album").to_dict()
+        assert album is not snapshot.get(VGMdbType.Album, 79)
+        assert list(snapshot.keys())[0] == (VGMdbType.Album, 79)
+
+
+def test_processes_share_file(tmp_path):
+    path = tmp_path / "objects.snap"
+    write_snapshot(objects(), path)
+    queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=lookup, args=(path, VGMdbType.Org, 42, queue))
+        for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert {queue.get() for _ in workers} == {str(parse("org").name)}
+
+
+def test_atomic_rebuild(tmp_path):
+    path = tmp_path / "objects.snap"
+    write_snapshot(objects()[:1], path)
+    with Snapshot(path) as snapshot:
+        assert not snapshot.reload()
+        write_snapshot(objects(), path)
+        # the open map still reads the old file
+        assert len(snapshot) == 1
+        assert snapshot.get(VGMdbType.Album, 79) is not None
+        assert snapshot.reload()
+        assert len(snapshot) == 5
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_reload_after_bad_file(tmp_path):
+    path = tmp_path / "objects.snap"
+    write_snapshot(objects()[:1], path)
+    with Snapshot(path) as snapshot:
+        broken = tmp_path / "broken.snap"
+        broken.write_bytes(b"not a snapshot")
+        os.replace(broken, path)
+        # the bad file is not taken for the current one
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                snapshot.reload()
+        # the old map stays in use and the next rebuild is picked up
+        assert len(snapshot) == 1
+        write_snapshot(objects(), path)
+        assert snapshot.reload()
+        assert len(snapshot) == 5
+
+
+def test_closed(tmp_path):
+    path = tmp_path / "objects.snap"
+    write_snapshot(objects()[:1], path)
+    snapshot = Snapshot(path)
+    snapshot.close()
+    with pytest.raises(ValueError, match="closed"):
+        snapshot.get(VGMdbType.Album, 79)
+    with pytest.raises(ValueError, match="closed"):
+        len(snapshot)
+
+
+def test_invalid_id(tmp_path):
+    path = tmp_path / "objects.snap"
+    write_snapshot(objects()[:1], path)
+    unlinked = parse("artist")
+    unlinked.id = -1
+    with pytest.raises(ValueError):
+        write_snapshot([*objects(), unlinked], path)
+    assert os.listdir(tmp_path) == ["objects.snap"]
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == 1
+
+
+def test_client_uses_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "objects.snap"
+    write_snapshot(objects(), path)
+
+    def get(id, type, timeout=None):
+        raise AssertionError("fetched")
+
+    monkeypatch.setattr(VGMdb, "_get", staticmethod(get))
+    with Snapshot(path) as snapshot:
+        monkeypatch.setattr(VGMdb, "snapshot", snapshot)
+        assert VGMdb.get(10, VGMdbType.Event).link.id == 10
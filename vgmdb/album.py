@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from .utils import (
     VGMdbObject,
     VGMdbType,
@@ -9,13 +11,18 @@ from .utils import (
     parse_date,
     parse_time,
 )
-import vgmdb
+from .artist import Artist
+from .org import Org
+from .sections import Sections
 
 from enum import Enum
-from lxml import etree
+from typing import TYPE_CHECKING
 import datetime
 import re
 
+if TYPE_CHECKING:
+    from lxml import etree
+
 
 class Album(VGMdbObject):
     class Category(Enum):
@@ -47,19 +54,19 @@ class Album(VGMdbObject):
     publish_format: str
     price: tuple[int, str]
     classification: list[str]
-    label: list["vgmdb.Org"]
-    publisher: list["vgmdb.Org"]
-    manufacturer: list["vgmdb.Org"]
-    distributor: list["vgmdb.Org"]
-    phonographic_copyright: list["vgmdb.Org"]
+    label: list[Org]
+    publisher: list[Org]
+    manufacturer: list[Org]
+    distributor: list[Org]
+    phonographic_copyright: list[Org]
     organizations: str
 
     # credits
-    composer: list["vgmdb.Artist"]
-    arranger: list["vgmdb.Artist"]
-    performer: list["vgmdb.Artist"]
-    lyricist: list["vgmdb.Artist"]
-    other_staff: list["vgmdb.Artist"]
+    composer: list[Artist]
+    arranger: list[Artist]
+    performer: list[Artist]
+    lyricist: list[Artist]
+    other_staff: list[Artist]
 
     # tracklist
     tracklist: list[Tracklist]
@@ -82,43 +89,55 @@ class Album(VGMdbObject):
         album.link = link
         if category_attr := link_element.attrib.get("class"):
             album.category = Album.Category(category_attr.split("-")[1])
-        if catalog := element.xpath("./td[1]/span/text()"):
+        if catalog := element.xpath("./td[1]/span/text()", smart_strings=False):
             album.catalog = catalog[0]
         if element.xpath("./td[2]/img"):
             album.child_album = True
         if release_date := element.xpath("./td[4]/a/text()"):
             album.release_date = parse_date(release_date[0])
-        if media_format := element.xpath("./td[5]/text()"):
+        if media_format := element.xpath("./td[5]/text()", smart_strings=False):
             album.media_format = media_format[0]
         return album
 
     @staticmethod
-    def from_page(page: etree._Element) -> "Album":
-        link_ekelement = page.xpath("/html/head/link[1]")[0]
-        link = Link.from_element(link_ekelement)
+    def from_element(element: etree._Element) -> "Album":
+        link = Link.from_element(element)
         album = Album(link.id)
-        if name := page.xpath("//*[@id='innermain']/h1"):
-            album.name = Name.from_element(name[0])
-        if picture := page.xpath("/html/head/meta[@property='og:image']"):
-            album.picture = Picture.from_url(picture[0].attrib["content"])
-        if info_table := page.xpath("//div[@id='rightfloat']//table"):
-            album.set_info(info_table[0])
-        if credits_table := page.xpath("//div[@id='collapse_credits']//table"):
-            album.set_credits(credits_table[0])
-        if tracklist := page.xpath("//div[@id='tracklist']/../.."):
-            album.set_tracklist(tracklist[0])
-        if notes := page.xpath("//div[@id='notes']"):
-            album.set_notes(notes[0])
-        if album_stats := page.xpath(
-            "//h3[text()='Album Stats']/../../following-sibling::div[1]/div"
-        ):
-            album.set_stats(album_stats[0])
-        if covers := page.xpath("//div[@id='cover_gallery']"):
-            album.set_covers(covers[0])
-        if related_albums := page.xpath(
-            "//h3[text()='Related Albums']/../../following-sibling::div[1]/span"
-        ):
-            album.set_related_albums(related_albums[0])
+        album.name = Name.from_element(element)
+        album.link = link
+        for class_name in element.attrib.get("class", "").split():
+            if class_name.startswith("album-"):
+                try:
+                    album.category = Album.Category(class_name.split("-")[1])
+                except ValueError:
+                    album.category = class_name.split("-")[1]
+        return album
+
+    @staticmethod
+    def from_page(page: etree._Element, sections: Sections | None = None) -> "Album":
+        sections = sections or Sections(page)
+        link = Link.from_element(sections.link)
+        album = Album(link.id)
+        if sections.title is not None:
+            album.name = Name.from_element(sections.title)
+        if picture := sections.meta.get("og:image"):
+            album.picture = Picture.from_url(picture)
+        if (info_table := sections.find("rightfloat", "table")) is not None:
+            album.set_info(info_table)
+        if (credits_table := sections.find("collapse_credits", "table")) is not None:
+            album.set_credits(credits_table)
+        if (tracklist := sections.get("tracklist")) is not None:
+            album.set_tracklist(tracklist.getparent().getparent())
+        if (notes := sections.get("notes")) is not None:
+            album.set_notes(notes)
+        if (album_stats := sections.heading("Album Stats")) is not None:
+            if (album_stats := album_stats.find("div")) is not None:
+                album.set_stats(album_stats)
+        if (covers := sections.get("cover_gallery")) is not None:
+            album.set_covers(covers)
+        if (related_albums := sections.heading("Related Albums")) is not None:
+            if (related_albums := related_albums.find("span")) is not None:
+                album.set_related_albums(related_albums)
         return album
 
     def set_info(self, info_table: etree._Element) -> None:
@@ -148,36 +167,34 @@ class Album(VGMdbObject):
                 self.classification = value.text.strip().split(", ")
             elif label == "Label":
                 orgs = value.xpath("./a")
-                self.label = [vgmdb.Org.from_element(org) for org in orgs]
+                self.label = [Org.from_element(org) for org in orgs]
             elif label == "Publisher":
                 orgs = value.xpath("./a")
-                self.publisher = [vgmdb.Org.from_element(org) for org in orgs]
+                self.publisher = [Org.from_element(org) for org in orgs]
             elif label == "Manufacturer":
                 orgs = value.xpath("./a")
-                self.manufacturer = [vgmdb.Org.from_element(org) for org in orgs]
+                self.manufacturer = [Org.from_element(org) for org in orgs]
             elif label == "Distributor":
                 orgs = value.xpath("./a")
-                self.distributor = [vgmdb.Org.from_element(org) for org in orgs]
+                self.distributor = [Org.from_element(org) for org in orgs]
             elif label == "Phonographic Copyright":
                 orgs = value.xpath("./a")
-                self.phonographic_copyright = [
-                    vgmdb.Org.from_element(org) for org in orgs
-                ]
+                self.phonographic_copyright = [Org.from_element(org) for org in orgs]
             elif label == "Organizations":
                 self.organizations = value.text.strip()
             elif label == "Exclusive Retailer":
                 orgs = value.xpath("./a")
-                self.exclusive_retailer = [vgmdb.Org.from_element(org) for org in orgs]
+                self.exclusive_retailer = [Org.from_element(org) for org in orgs]
             elif label == "Marketer":
                 orgs = value.xpath("./a")
-                self.marketer = [vgmdb.Org.from_element(org) for org in orgs]
+                self.marketer = [Org.from_element(org) for org in orgs]
             else:
                 try:
                     orgs = value.xpath("./a")
                     setattr(
                         self,
                         label.lower().replace(" ", "_"),
-                        [vgmdb.Org.from_element(org) for org in orgs],
+                        [Org.from_element(org) for org in orgs],
                     )
                 except AttributeError:
                     raise ValueError(f"Unknown label {label}")
@@ -191,23 +208,23 @@ class Album(VGMdbObject):
             if "compose" in label:
                 if not hasattr(self, "composer"):
                     self.composer = []
-                self.composer += vgmdb.Artist.from_mixed_td(value, label)
+                self.composer += Artist.from_mixed_td(value, label)
             elif "arrange" in label:
                 if not hasattr(self, "arranger"):
                     self.arranger = []
-                self.arranger += vgmdb.Artist.from_mixed_td(value, label)
+                self.arranger += Artist.from_mixed_td(value, label)
             elif "performe" in label:
                 if not hasattr(self, "performer"):
                     self.performer = []
-                self.performer += vgmdb.Artist.from_mixed_td(value, label)
+                self.performer += Artist.from_mixed_td(value, label)
             elif "lyric" in label:
                 if not hasattr(self, "lyricist"):
                     self.lyricist = []
-                self.lyricist += vgmdb.Artist.from_mixed_td(value, label)
+                self.lyricist += Artist.from_mixed_td(value, label)
             else:
                 if not hasattr(self, "other_staff"):
                     self.other_staff = []
-                self.other_staff += vgmdb.Artist.from_mixed_td(value, label)
+                self.other_staff += Artist.from_mixed_td(value, label)
 
     def set_tracklist(self, tracklist_element: etree._Element) -> None:
         languages = {
@@ -304,7 +321,7 @@ class Album(VGMdbObject):
         covers = covers_element.xpath(".//td/a")
         self.covers = {}
         for cover in covers:
-            name = cover.xpath("./h4/text()")[0]
+            name = cover.xpath("./h4/text()", smart_strings=False)[0]
             href = cover.attrib["href"]
             picture = Picture.from_url(href)
             self.covers[name] = picture
@@ -320,8 +337,11 @@ class Album(VGMdbObject):
                 album.link = link
                 if category_attr := link_element[0].attrib.get("class"):
                     album.category = Album.Category(category_attr.split("-")[1])
-                if catalog := related_album.xpath("./ul/li[2]/span/text()")[0]:
-                    album.catalog = catalog
+                catalog = related_album.xpath(
+                    "./ul/li[2]/span/text()", smart_strings=False
+                )
+                if catalog[0]:
+                    album.catalog = catalog[0]
                 if release_date := related_album.xpath("./ul/li[3]/text()"):
                     album.release_date = parse_date(release_date[0])
                 if picture := related_album.xpath("./div/div/@style"):
@@ -335,8 +355,9 @@ class Album(VGMdbObject):
                 album = Album(link.id)
                 album.name = Name.from_element(link_element[0])
                 album.link = link
-                if catalog := related_album.xpath("./span/text()")[0]:
-                    album.catalog = catalog
+                catalog = related_album.xpath("./span/text()", smart_strings=False)
+                if catalog[0]:
+                    album.catalog = catalog[0]
                 self.related_albums.append(album)
             else:
                 raise ValueError("Unknown related album type")
@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+from .utils import Link, VGMdbObject, VGMdbType
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterator
+import itertools
+import os
+import re
+import struct
+import threading
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+MAGIC = b"VGMDBAR1"
+# dictionary offset and length, index offset, number of pages, magic
+FOOTER = struct.Struct("<QQQQ8s")
+# type, id, offset and length of a compressed page
+ENTRY = struct.Struct("<BIQI")
+MAX_ID = 0xFFFFFFFF
+DICTIONARY_SIZE = 112 * 1024
+
+_PAGE_PATH = re.compile(rf"^/(?:{VGMdbType.join()})/\d+$")
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstandard is required for page archives, install it with `pip install vgmdb[archive]`"
+        )
+    return zstandard
+
+
+def train_dictionary(pages: list[bytes], size: int = DICTIONARY_SIZE) -> bytes:
+    """Train a zstd dictionary on sample pages.
+
+    Args:
+        pages (list[bytes]): The sample pages.
+        size (int, optional): Maximum size of the dictionary in bytes. Defaults to `DICTIONARY_SIZE`.
+
+    Returns:
+        bytes: The dictionary, empty if there are too few samples to train one.
+    """
+    zstd = _require_zstandard()
+    try:
+        return zstd.train_dictionary(size, pages).as_bytes()
+    except zstd.ZstdError:
+        return b""
+
+
+class ArchiveWriter:
+    """Writes raw pages to a new archive.
+
+    Every page is a zstd frame compressed with a dictionary shared by the
+    archive. Without a given dictionary the first `samples` pages are kept
+    in memory and the dictionary is trained on them. The archive is written
+    to a temporary file and moved into place by `close`, so readers never
+    see a partial archive. Adding a page again replaces it.
+
+    Args:
+        path (str | os.PathLike): The archive file.
+        dictionary (bytes | None, optional): A dictionary to use, e.g. `Archive.dictionary` of a previous archive. Defaults to None.
+        level (int, optional): The zstd compression level. Defaults to 10.
+        samples (int, optional): Pages to train the dictionary on. Defaults to 1000.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        dictionary: bytes | None = None,
+        level: int = 10,
+        samples: int = 1000,
+    ) -> None:
+        self.zstd = _require_zstandard()
+        self.path = os.fspath(path)
+        self.level = level
+        self.samples = samples
+        self.index: dict[tuple[int, int], tuple[int, int]] = {}
+        self.pending: list[tuple[Link, bytes]] = []
+        self.dictionary = dictionary
+        self.compressor = None
+        self.lock = threading.Lock()
+        self.file = open(f"{self.path}.tmp", "wb")
+        self.file.write(MAGIC)
+        if dictionary is not None:
+            self._start()
+
+    def _start(self) -> None:
+        if self.dictionary is None:
+            self.dictionary = train_dictionary([i for _, i in self.pending])
+        dictionary = (
+            self.zstd.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+        )
+        self.compressor = self.zstd.ZstdCompressor(
+            level=self.level, dict_data=dictionary
+        )
+        pending, self.pending = self.pending, []
+        for link, content in pending:
+            self._write(link, content)
+
+    def _write(self, link: Link, content: bytes) -> None:
+        data = self.compressor.compress(content)
+        self.index[(link.type.value, link.id)] = (self.file.tell(), len(data))
+        self.file.write(data)
+
+    def add(self, link: Link, content: bytes) -> None:
+        """Add the raw page of an object.
+
+        Args:
+            link (Link): The object.
+            content (bytes): The page as received.
+
+        Raises:
+            ValueError: If the ID does not fit in the index.
+        """
+        if not 0 <= link.id <= MAX_ID:
+            raise ValueError(f"ID out of range: {link.id}")
+        with self.lock:
+            if self.compressor is not None:
+                self._write(link, content)
+                return
+            self.pending.append((link, content))
+            if len(self.pending) >= self.samples:
+                self._start()
+
+    def add_page(self, url: str, content: bytes) -> bool:
+        """Add a page by its URL, ignoring pages that are not objects, e.g. searches.
+
+        Args:
+            url (str): The URL of the page.
+            content (bytes): The page as received.
+
+        Returns:
+            bool: True if the page was added.
+        """
+        if not _PAGE_PATH.match(urlsplit(url).path):
+            return False
+        self.add(Link.from_url(url), content)
+        return True
+
+    def close(self) -> None:
+        """Write the dictionary and the index and move the archive into place.
+
+        If writing fails the temporary file is removed and the previous
+        archive, if any, is left untouched.
+        """
+        with self.lock:
+            if self.file.closed:
+                return
+            try:
+                if self.compressor is None:
+                    self._start()
+                dictionary_offset = self.file.tell()
+                self.file.write(self.dictionary)
+                index_offset = self.file.tell()
+                for (type, id), (offset, length) in sorted(self.index.items()):
+                    self.file.write(ENTRY.pack(type, id, offset, length))
+                self.file.write(
+                    FOOTER.pack(
+                        dictionary_offset,
+                        len(self.dictionary),
+                        index_offset,
+                        len(self.index),
+                        MAGIC,
+                    )
+                )
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                os.replace(f"{self.path}.tmp", self.path)
+            except BaseException:
+                self._discard()
+                raise
+
+    def _discard(self) -> None:
+        self.file.close()
+        try:
+            os.remove(f"{self.path}.tmp")
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Archive:
+    """Random access to the pages of an archive.
+
+    The index is loaded on open; reading a page is a dictionary lookup, one
+    positioned read and one decompression. Safe to share between threads.
+
+    Args:
+        path (str | os.PathLike): The archive file.
+
+    Raises:
+        ValueError: If the file is not an archive.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.zstd = _require_zstandard()
+        self.path = os.fspath(path)
+        self.file = open(self.path, "rb")
+        self.fd = self.file.fileno()
+        size = os.fstat(self.fd).st_size
+        if size < len(MAGIC) + FOOTER.size or os.pread(self.fd, len(MAGIC), 0) != MAGIC:
+            self.file.close()
+            raise ValueError(f"Not a page archive: {self.path}")
+        footer = os.pread(self.fd, FOOTER.size, size - FOOTER.size)
+        dictionary_offset, dictionary_length, index_offset, count, magic = (
+            FOOTER.unpack(footer)
+        )
+        if magic != MAGIC:
+            self.file.close()
+            raise ValueError(f"Incomplete page archive: {self.path}")
+        self.dictionary = os.pread(self.fd, dictionary_length, dictionary_offset)
+        entries = os.pread(self.fd, count * ENTRY.size, index_offset)
+        self.index = {
+            (type, id): (offset, length)
+            for type, id, offset, length in ENTRY.iter_unpack(entries)
+        }
+        self.local = threading.local()
+
+    @property
+    def decompressor(self):
+        if (decompressor := getattr(self.local, "decompressor", None)) is None:
+            dictionary = (
+                self.zstd.ZstdCompressionDict(self.dictionary)
+                if self.dictionary
+                else None
+            )
+            decompressor = self.zstd.ZstdDecompressor(dict_data=dictionary)
+            self.local.decompressor = decompressor
+        return decompressor
+
+    def get(self, link: Link) -> bytes | None:
+        """Get the raw page of an object.
+
+        Args:
+            link (Link): The object.
+
+        Returns:
+            bytes | None: The page if archived, None otherwise.
+        """
+        if (entry := self.index.get((link.type.value, link.id))) is None:
+            return None
+        offset, length = entry
+        return self.decompressor.decompress(os.pread(self.fd, length, offset))
+
+    def parse(self, link: Link) -> VGMdbObject | None:
+        """Parse the archived page of an object with the current parsers.
+
+        Args:
+            link (Link): The object.
+
+        Returns:
+            VGMdbObject | None: The object, None if the page is not archived or is an error page.
+        """
+        if (content := self.get(link)) is None:
+            return None
+        from .client import VGMdb
+
+        return VGMdb.parse_page(parse_html(content), link.type)
+
+    def links(self) -> list[Link]:
+        """Get the archived objects, ordered by type and ID.
+
+        Returns:
+            list[Link]: The links of the archived objects.
+        """
+        return [Link(VGMdbType(type), id) for type, id in sorted(self.index)]
+
+    def __contains__(self, link: Link) -> bool:
+        return (link.type.value, link.id) in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[tuple[Link, bytes]]:
+        for link in self.links():
+            yield link, self.get(link)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def parse_html(content: bytes) -> etree._Element:
+    """Parse a raw page, using the charset it declares.
+
+    Args:
+        content (bytes): The page.
+
+    Returns:
+        etree._Element: The parsed page.
+    """
+    from lxml import etree
+
+    return etree.HTML(content, etree.HTMLParser())
+
+
+_open: dict[str, Archive] = {}
+
+
+def _reparse(
+    path: str, links: list[Link]
+) -> list[tuple[Link, VGMdbObject | None, str | None]]:
+    if (archive := _open.get(path)) is None:
+        archive = _open[path] = Archive(path)
+    results = []
+    for link in links:
+        # one page the parsers cannot handle must not lose the rest of the chunk
+        try:
+            results.append((link, archive.parse(link), None))
+        except Exception as e:
+            results.append((link, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def reparse(
+    path: str | os.PathLike, workers: int | None = None, chunk_size: int = 256
+) -> Iterator[tuple[Link, VGMdbObject | None, str | None]]:
+    """Parse every page of an archive with the current parsers, in parallel processes.
+
+    A page that fails to parse is reported with its error and the re-parse
+    goes on with the next page.
+
+    Args:
+        path (str | os.PathLike): The archive file.
+        workers (int | None, optional): The number of processes. Defaults to the number of CPUs.
+        chunk_size (int, optional): Pages parsed per task. Defaults to 256.
+
+    Yields:
+        tuple[Link, VGMdbObject | None, str | None]: Every archived object, its parsed object and the error if parsing failed, in archive order.
+    """
+    path = os.fspath(path)
+    with Archive(path) as archive:
+        links = archive.links()
+    chunks = [links[i : i + chunk_size] for i in range(0, len(links), chunk_size)]
+    with ProcessPoolExecutor(workers) as executor:
+        for results in executor.map(_reparse, itertools.repeat(path), chunks):
+            yield from results
@@ -1,6 +1,15 @@
-from .utils import VGMdbObject, VGMdbType, Name, Link
+from __future__ import annotations
 
-from lxml import etree
+from .utils import VGMdbObject, VGMdbType, Name, Link, Picture, parse_date
+from .sections import Sections, set_details, split_names, text
+
+from typing import TYPE_CHECKING
+import datetime
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+    from .album import Album
 
 
 class Artist(VGMdbObject):
@@ -8,6 +17,13 @@ class Artist(VGMdbObject):
     aliases: list[str] | None
     role: str | None
 
+    # details
+    picture: Picture | None
+    birthdate: datetime.date | None
+    info: dict[str, str]
+    notes: str
+    albums: list[Album]
+
     def __init__(self, id: int | str | None, name: str | Name | None = None) -> None:
         super().__init__(id if id else -1, name)
 
@@ -22,8 +38,20 @@ class Artist(VGMdbObject):
         return artist
 
     @staticmethod
-    def from_page(page) -> "Artist":
-        return Artist(-1)  # TODO
+    def from_page(page: etree._Element, sections: Sections | None = None) -> "Artist":
+        sections = sections or Sections(page)
+        artist = Artist(Link.from_element(sections.link).id)
+        for label, value in set_details(artist, sections).items():
+            if label in ("Aliases", "Alias", "Also Known As", "Variations"):
+                artist.aliases = (getattr(artist, "aliases", None) or []) + split_names(
+                    text(value)
+                )
+            elif label in ("Birthdate", "Date of Birth"):
+                try:
+                    artist.birthdate = parse_date(text(value).split("(")[0].strip())
+                except ValueError:
+                    artist.birthdate = None
+        return artist
 
     @staticmethod
     def from_element(element: etree._Element, role: str | None = None) -> "Artist":
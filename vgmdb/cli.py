@@ -0,0 +1,520 @@
+from .utils import VGMdbType, to_dict
+from .scheduler import Scheduler
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, TextIO
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+Task = tuple[str, Callable[[], list[dict[str, Any]]]]
+
+
+def parse_range(value: str) -> range:
+    """Parse an ID or an inclusive ID range such as ``1-100``.
+
+    Args:
+        value (str): The ID or range.
+
+    Raises:
+        ValueError: If the value is not an ID or a range, or the range ends before it starts.
+
+    Returns:
+        range: The IDs.
+    """
+    start, sep, stop = value.partition("-")
+    if not start.isdigit() or (sep and not stop.isdigit()):
+        raise ValueError(f"invalid ID or range: {value!r}")
+    if not sep:
+        stop = start
+    if int(stop) < int(start):
+        raise ValueError(f"range ends before it starts: {value!r}")
+    return range(int(start), int(stop) + 1)
+
+
+def parse_ids(values: Iterable[str]) -> Iterator[int]:
+    """Expand IDs and inclusive ID ranges such as ``1-100``.
+
+    Args:
+        values (Iterable[str]): IDs, ranges or comma separated lists of both.
+
+    Raises:
+        ValueError: If a value is not an ID or a range, or a range ends before it starts.
+
+    Yields:
+        int: The IDs in order.
+    """
+    for value in values:
+        for part in value.replace(",", " ").split():
+            yield from parse_range(part)
+
+
+def id_list(value: str) -> str:
+    """Check an ``ids`` argument, expanded later by `parse_ids`."""
+    try:
+        for part in value.replace(",", " ").split():
+            parse_range(part)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def id_range(value: str) -> range:
+    """Parse a ``START-STOP`` argument."""
+    try:
+        return parse_range(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Read the non-empty lines of a file, ``-`` for stdin. ``#`` starts a comment.
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        str: The stripped lines.
+    """
+    file = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in file:
+            if line := line.split("#", 1)[0].strip():
+                yield line
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+class Output:
+    """Writes records as JSON Lines, flushing after every record."""
+
+    def __init__(self, file: TextIO) -> None:
+        self.file = file
+        self.lock = threading.Lock()
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+
+
+class Progress:
+    """Reports progress and throughput on stderr."""
+
+    def __init__(
+        self, total: int | None, enabled: bool = True, interval: float = 1.0
+    ) -> None:
+        self.total = total
+        self.enabled = enabled
+        self.interval = interval
+        self.done = 0
+        self.records = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.reported = self.started
+        self.lock = threading.Lock()
+
+    def update(self, records: int = 0, error: bool = False) -> None:
+        with self.lock:
+            self.done += 1
+            self.records += records
+            self.errors += error
+            now = time.monotonic()
+            if now - self.reported >= self.interval:
+                self.reported = now
+                self.report(final=False)
+
+    def report(self, final: bool = True) -> None:
+        if not self.enabled:
+            return
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        done = f"{self.done}/{self.total}" if self.total is not None else self.done
+        end = "\n" if final else ""
+        sys.stderr.write(
+            f"\r{done} done, {self.records} records, {self.errors} errors, "
+            f"{rate:.2f}/s, {elapsed:.0f}s elapsed{end}"
+        )
+        sys.stderr.flush()
+
+
+def run(tasks: Iterable[Task], jobs: int, output: Output, progress: Progress) -> None:
+    """Run tasks on a thread pool and stream their records to the output.
+
+    Only a bounded window of tasks is submitted at once, so arbitrarily long
+    task streams run in constant memory.
+
+    Args:
+        tasks (Iterable[Task]): Labelled tasks, each returning a list of records.
+        jobs (int): Number of tasks to run in parallel.
+        output (Output): Where to write the records.
+        progress (Progress): Progress reporter.
+    """
+    pending: dict[Future, str] = {}
+
+    def collect(future: Future) -> None:
+        label = pending.pop(future)
+        try:
+            records = future.result()
+        except Exception as e:
+            sys.stderr.write(f"\nvgmdb: {label}: {e}\n")
+            progress.update(error=True)
+            return
+        for record in records:
+            output.write(record)
+        progress.update(len(records))
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for label, task in tasks:
+            if len(pending) >= jobs * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            pending[executor.submit(task)] = label
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+    progress.report()
+
+
+def cookie(argument: str) -> tuple[str, str]:
+    """Parse a ``KEY=VALUE`` cookie argument."""
+    key, sep, value = argument.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {argument!r}")
+    return key, value
+
+
+def fetch_tasks(ids: Iterable[int], type: VGMdbType) -> Iterator[Task]:
+    from .client import VGMdb
+
+    def task(id: int) -> list[dict[str, Any]]:
+        if obj := VGMdb.get(id, type):
+            return [obj.to_dict()]
+        return []
+
+    for id in ids:
+        yield f"{type}/{id}", lambda id=id: task(id)
+
+
+def search_tasks(queries: Iterable[str], type: VGMdbType | None) -> Iterator[Task]:
+    from .client import VGMdb
+
+    def task(query: str) -> list[dict[str, Any]]:
+        return [dict(query=query, **i.to_dict()) for i in VGMdb.search(query, type)]
+
+    for query in queries:
+        yield f"search {query!r}", lambda query=query: task(query)
+
+
+def cover_tasks(ids: Iterable[int], size: str, directory: str | None) -> Iterator[Task]:
+    from .client import VGMdb
+
+    def url(obj: Any) -> str:
+        return getattr(obj, f"{size}_url")()
+
+    def task(id: int) -> list[dict[str, Any]]:
+        album = VGMdb.get_album(id)
+        if not album:
+            return []
+        covers = getattr(album, "covers", {})
+        record = {
+            "id": album.id,
+            "name": to_dict(album.name),
+            "picture": url(album.picture) if album.picture else None,
+            "covers": {name: url(picture) for name, picture in covers.items()},
+        }
+        if directory:
+            record["files"] = {}
+            os.makedirs(os.path.join(directory, str(id)), exist_ok=True)
+            for name, cover_url in record["covers"].items():
+                path = os.path.join(
+                    directory, str(id), f"{name.replace(os.sep, '_')}.jpg"
+                )
+                content = VGMdb.download(cover_url)
+                with open(path, "wb") as f:
+                    f.write(content)
+                record["files"][name] = path
+        return [record]
+
+    for id in ids:
+        yield f"album/{id} covers", lambda id=id: task(id)
+
+
+def crawl(args: argparse.Namespace, output: Output, progress: Progress) -> None:
+    """Run ``args.jobs`` crawl workers on the lease store ``args.store``."""
+    from .crawl import CrawlWorker, fetch_object, open_store
+
+    store = open_store(args.store)
+    if args.range:
+        store.create(args.type, args.range.start, args.range.stop, args.lease_size)
+    fetch = fetch_object(args.type)
+
+    def write(id: int, obj: Any) -> None:
+        if obj:
+            output.write(obj.to_dict())
+        progress.update(1 if obj else 0)
+
+    def error(id: int, e: Exception) -> None:
+        sys.stderr.write(f"\nvgmdb: {args.type}/{id}: {e}\n")
+        progress.update(error=True)
+
+    workers = [
+        CrawlWorker(store, args.type, write, fetch, args.ttl, error=error)
+        for _ in range(max(args.jobs, 1))
+    ]
+    with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+        for future in [executor.submit(worker.run) for worker in workers]:
+            future.result()
+    progress.report()
+
+
+def reparse_archive(
+    args: argparse.Namespace, output: Output, progress: Progress
+) -> None:
+    """Parse every page of the archive ``args.archive`` again."""
+    from .archive import reparse
+
+    for link, obj, error in reparse(args.archive, args.jobs):
+        if error is not None:
+            sys.stderr.write(f"\nvgmdb: {link}: {error}\n")
+            progress.update(error=True)
+            continue
+        if obj:
+            output.write(obj.to_dict())
+        progress.update(1 if obj else 0)
+    progress.report()
+
+
+def parser() -> argparse.ArgumentParser:
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument(
+        "-o", "--output", default="-", help="JSON Lines output file (default: stdout)"
+    )
+    output.add_argument(
+        "-q", "--quiet", action="store_true", help="do not report progress"
+    )
+
+    common = argparse.ArgumentParser(add_help=False, parents=[output])
+    common.add_argument(
+        "-j", "--jobs", type=int, default=1, help="parallel requests (default: 1)"
+    )
+    common.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="maximum requests per second, hedges and cover downloads included, "
+        "0 for no limit (default: 1)",
+    )
+    common.add_argument(
+        "--burst",
+        type=int,
+        default=1,
+        help="requests allowed back to back (default: 1)",
+    )
+    common.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="deadline per request in seconds (default: 60)",
+    )
+    common.add_argument(
+        "--hedge",
+        type=float,
+        metavar="DELAY",
+        help="send a duplicate request when no response arrived after DELAY seconds",
+    )
+    common.add_argument("--proxy", help="proxy to use for requests")
+    common.add_argument(
+        "--cookie",
+        type=cookie,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="cookie to send with requests, may be repeated",
+    )
+    common.add_argument(
+        "--archive",
+        metavar="FILE",
+        help="also store the raw pages of fetched objects in a page archive",
+    )
+
+    ids = argparse.ArgumentParser(add_help=False)
+    ids.add_argument("ids", nargs="*", type=id_list, help="IDs or ranges such as 1-100")
+    ids.add_argument(
+        "-f", "--file", help="file with IDs or ranges, one per line, - for stdin"
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="vgmdb", description="Fetch data from VGMdb as JSON Lines."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch = subparsers.add_parser(
+        "fetch", parents=[common, ids], help="fetch objects by ID"
+    )
+    fetch.add_argument(
+        "-t",
+        "--type",
+        type=VGMdbType.from_str,
+        default=VGMdbType.Album,
+        help=f"object type, one of {VGMdbType.join()} (default: album)",
+    )
+
+    search = subparsers.add_parser("search", parents=[common], help="search VGMdb")
+    search.add_argument("queries", nargs="*", help="search queries")
+    search.add_argument(
+        "-f", "--file", help="file with queries, one per line, - for stdin"
+    )
+    search.add_argument(
+        "-t",
+        "--type",
+        type=VGMdbType.from_str,
+        help=f"object type, one of {VGMdbType.join()} (default: all)",
+    )
+
+    covers = subparsers.add_parser(
+        "covers", parents=[common, ids], help="list or download album covers"
+    )
+    covers.add_argument(
+        "--size",
+        choices=["full", "medium", "thumb"],
+        default="full",
+        help="cover size (default: full)",
+    )
+    covers.add_argument(
+        "-d", "--download", metavar="DIR", help="download covers to DIR"
+    )
+
+    crawl = subparsers.add_parser(
+        "crawl",
+        parents=[common],
+        help="crawl ID ranges leased from a store shared by several workers",
+    )
+    crawl.add_argument(
+        "store",
+        help="lease store, SQLite for .db/.sqlite/.sqlite3, a JSON lease file otherwise",
+    )
+    crawl.add_argument(
+        "-t",
+        "--type",
+        type=VGMdbType.from_str,
+        default=VGMdbType.Album,
+        help=f"object type, one of {VGMdbType.join()} (default: album)",
+    )
+    crawl.add_argument(
+        "--range",
+        type=id_range,
+        metavar="START-STOP",
+        help="add leases for the IDs START to STOP, existing leases are kept",
+    )
+    crawl.add_argument(
+        "--lease-size",
+        type=int,
+        default=100,
+        help="IDs per lease when adding leases (default: 100)",
+    )
+    crawl.add_argument(
+        "--ttl",
+        type=float,
+        default=60.0,
+        help="seconds until a lease without heartbeat is reassigned (default: 60)",
+    )
+
+    reparse = subparsers.add_parser(
+        "reparse",
+        parents=[output],
+        help="parse the pages of a page archive with the current parsers",
+    )
+    reparse.add_argument("archive", help="page archive written with --archive")
+    reparse.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="parallel processes (default: number of CPUs)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the ``vgmdb`` command.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status.
+    """
+    arguments = parser()
+    args = arguments.parse_args(argv)
+    values = list(read_lines(args.file)) if getattr(args, "file", None) else []
+    if args.command in ("fetch", "covers"):
+        try:
+            ids = list(parse_ids(args.ids + values))
+        except ValueError as e:
+            arguments.error(f"{args.file}: {e}")
+    from .client import VGMdb
+
+    archive = None
+    if args.command != "reparse":
+        VGMdb.set_timeout(args.timeout)
+        VGMdb.set_hedging(args.hedge)
+        if args.proxy:
+            VGMdb.set_proxy(args.proxy)
+        if args.cookie:
+            VGMdb.set_cookies(dict(args.cookie))
+        if args.archive:
+            from .archive import ArchiveWriter
+
+            archive = ArchiveWriter(args.archive)
+            VGMdb.set_archive(archive)
+        # one limit for every request, including hedges and cover downloads
+        scheduler = VGMdb.scheduler
+        VGMdb.set_scheduler(Scheduler(args.rate, args.burst))
+
+    if args.command in ("crawl", "reparse"):
+        total, tasks = None, None
+    elif args.command == "search":
+        queries = args.queries + values
+        total = len(queries)
+        tasks = search_tasks(queries, args.type)
+    else:
+        total = len(ids)
+        if args.command == "fetch":
+            tasks = fetch_tasks(ids, args.type)
+        else:
+            tasks = cover_tasks(ids, args.size, args.download)
+
+    file = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    progress = Progress(total, not args.quiet)
+    try:
+        if args.command == "crawl":
+            crawl(args, Output(file), progress)
+        elif args.command == "reparse":
+            reparse_archive(args, Output(file), progress)
+        else:
+            run(tasks, max(args.jobs, 1), Output(file), progress)
+    except BrokenPipeError:
+        # the consumer stopped reading, e.g. `vgmdb fetch 1-100 | head`
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except KeyboardInterrupt:
+        progress.report()
+        return 130
+    finally:
+        if file is not sys.stdout:
+            file.close()
+        if args.command != "reparse":
+            VGMdb.set_scheduler(scheduler)
+        if archive is not None:
+            VGMdb.set_archive(None)
+            archive.close()
+    return 1 if progress.errors else 0
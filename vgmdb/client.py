@@ -0,0 +1,608 @@
+from .utils import VGMdbObject, VGMdbType
+from .album import Album
+from .artist import Artist
+from .event import Event
+from .org import Org
+from .product import Product
+from .archive import ArchiveWriter
+from .deadline import Deadline, Hedger
+from .scheduler import Scheduler, current_priority
+from .sections import Sections
+from .snapshot import Snapshot
+from .singleflight import SingleFlight, AsyncSingleFlight
+
+import requests
+import urllib3
+from lxml import etree
+from typing import Any, Iterator, cast
+import asyncio
+import codecs
+import contextlib
+import socket
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _socket(raw: Any) -> socket.socket | None:
+    # urllib3 detaches the socket from its connection while the response is
+    # read, it is only reachable through the file object of http.client
+    fp = getattr(getattr(raw, "_fp", None), "fp", None)
+    return getattr(getattr(fp, "raw", None), "_sock", None)
+
+
+def iter_body(
+    response: requests.Response, deadline: Deadline | None = None
+) -> Iterator[bytes]:
+    """Iterate over a streamed response body as data arrives.
+
+    Every read waits at most until the deadline, and errors of urllib3 are
+    raised as the matching errors of requests.
+
+    Args:
+        response (requests.Response): A response requested with ``stream=True``.
+        deadline (Deadline | None, optional): Deadline for reading the body. Defaults to None.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before the body is read.
+
+    Yields:
+        bytes: The decoded body, in chunks of at most `CHUNK_SIZE` bytes.
+    """
+    deadline = deadline or Deadline(None)
+    raw = response.raw
+    if not hasattr(raw, "read1"):
+        for chunk in response.iter_content(CHUNK_SIZE):
+            deadline.check()
+            yield chunk
+        return
+    # the read timeout of the request is the time left when it was sent,
+    # the socket's timeout is shortened before each read instead
+    sock = _socket(raw)
+    while True:
+        deadline.check()
+        if sock is not None and (remaining := deadline.remaining()) is not None:
+            sock.settimeout(max(remaining, 0.001))
+        try:
+            # urllib3 2 returns whatever is available instead of waiting for a full chunk
+            chunk = raw.read1(CHUNK_SIZE, decode_content=True)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            deadline.check()
+            raise requests.ReadTimeout(e, request=response.request)
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.ConnectionError(e, request=response.request)
+        except urllib3.exceptions.DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e, request=response.request)
+        if not chunk:
+            return
+        yield chunk
+
+
+def declared_encoding(response: requests.Response) -> str | None:
+    """Get the charset declared in the ``Content-Type`` header of a response.
+
+    Unlike ``response.encoding`` there is no fallback to ISO-8859-1, so
+    without a declared charset the parser uses the page's ``meta`` charset.
+
+    Args:
+        response (requests.Response): The response.
+
+    Returns:
+        str | None: The charset if declared and known, None otherwise.
+    """
+    for param in response.headers.get("Content-Type", "").split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            value = value.strip().strip("\"'")
+            try:
+                return codecs.lookup(value).name
+            except LookupError:
+                return None
+    return None
+
+
+class VGMdb:
+    """VGMdb API client.
+    """
+    session = requests.Session()
+    base_url = "https://vgmdb.net"
+    singleflight: SingleFlight = SingleFlight()
+    async_singleflight: AsyncSingleFlight = AsyncSingleFlight()
+    timeout: float | None = 60.0
+    hedger: Hedger = Hedger()
+    scheduler: Scheduler | None = None
+    archive: ArchiveWriter | None = None
+    snapshot: Snapshot | None = None
+
+    @staticmethod
+    def get(
+        id: int, type: VGMdbType, timeout: float | None = None
+    ) -> VGMdbObject | None:
+        """Get an object from VGMdb.
+
+        Objects in `VGMdb.snapshot` are returned without a request.
+        Concurrent calls for the same object and of the same request class
+        share one fetch, each caller gets its own copy of the result.
+
+        Args:
+            id (int): ID of the object.
+            type (VGMdbType): Type of the object.
+            timeout (float | None, optional): Deadline in seconds for connecting, reading and parsing. Defaults to `VGMdb.timeout`.
+
+        Raises:
+            DeadlineExceeded: If the object could not be fetched in time.
+
+        Returns:
+            VGMdbObject | None: The object if found, None otherwise.
+        """
+        if VGMdb.snapshot is not None:
+            if (obj := VGMdb.snapshot.get(type, id)) is not None:
+                return obj
+        timeout = VGMdb.timeout if timeout is None else timeout
+        # calls of different request classes are not coalesced, an urgent
+        # call must not wait behind a queued bulk call for the same object
+        return VGMdb.singleflight.do(
+            (type, id, current_priority()),
+            lambda: VGMdb._get(id, type, timeout),
+            timeout,
+        )
+
+    @staticmethod
+    async def get_async(
+        id: int, type: VGMdbType, timeout: float | None = None
+    ) -> VGMdbObject | None:
+        """Get an object from VGMdb without blocking the event loop.
+
+        Concurrent calls for the same object, from coroutines or threads,
+        share one fetch.
+
+        Args:
+            id (int): ID of the object.
+            type (VGMdbType): Type of the object.
+            timeout (float | None, optional): Deadline in seconds. Defaults to `VGMdb.timeout`.
+
+        Returns:
+            VGMdbObject | None: The object if found, None otherwise.
+        """
+        return await VGMdb.async_singleflight.do(
+            (type, id, current_priority()),
+            lambda: asyncio.to_thread(VGMdb.get, id, type, timeout),
+        )
+
+    @staticmethod
+    def _get(id: int, type: VGMdbType, timeout: float | None) -> VGMdbObject | None:
+        url = f"{VGMdb.base_url}/{type}/{id}"
+        priority = current_priority()
+        return VGMdb.hedger.run(
+            lambda deadline: VGMdb.parse_page(
+                VGMdb.fetch_page(url, deadline, priority), type
+            ),
+            Deadline(timeout),
+        )
+
+    @staticmethod
+    def fetch_page(
+        url: str, deadline: Deadline | None = None, priority: str | None = None
+    ) -> etree._Element:
+        """Download and parse a page.
+
+        The body is fed to the parser chunk by chunk as it arrives, decoded
+        by libxml2 with the charset declared by the response or the page.
+        With a scheduler set, the request waits for its turn in the request
+        class `priority` first.
+
+        Args:
+            url (str): The URL of the page.
+            deadline (Deadline | None, optional): Deadline for waiting, connecting and reading. Defaults to None.
+            priority (str | None, optional): The request class. Defaults to the class of the current context.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before the page is downloaded.
+
+        Returns:
+            etree._Element: The parsed page.
+        """
+        deadline = deadline or Deadline(None)
+        deadline.check()
+        try:
+            with (
+                VGMdb._slot(deadline, priority),
+                VGMdb.session.get(
+                    url, timeout=deadline.remaining(), stream=True
+                ) as response,
+            ):
+                response.raise_for_status()
+                parser = etree.HTMLParser(encoding=declared_encoding(response))
+                # the raw page is only kept when it is archived
+                content = bytearray() if VGMdb.archive is not None else None
+                for chunk in iter_body(response, deadline):
+                    parser.feed(chunk)
+                    if content is not None:
+                        content += chunk
+        except requests.Timeout:
+            deadline.check()
+            raise
+        if content is not None:
+            VGMdb.archive.add_page(url, bytes(content))
+        return parser.close()
+
+    @staticmethod
+    def download(url: str, timeout: float | None = None) -> bytes:
+        """Download a file, e.g. a cover, like a page.
+
+        The download waits for its turn in the scheduler and the whole
+        download, including the wait, is bounded by one deadline.
+
+        Args:
+            url (str): The URL of the file.
+            timeout (float | None, optional): Deadline in seconds. Defaults to `VGMdb.timeout`.
+
+        Raises:
+            DeadlineExceeded: If the file could not be downloaded in time.
+
+        Returns:
+            bytes: The content of the file.
+        """
+        deadline = Deadline(VGMdb.timeout if timeout is None else timeout)
+        deadline.check()
+        try:
+            with (
+                VGMdb._slot(deadline, None),
+                VGMdb.session.get(
+                    url, timeout=deadline.remaining(), stream=True
+                ) as response,
+            ):
+                response.raise_for_status()
+                return b"".join(iter_body(response, deadline))
+        except requests.Timeout:
+            deadline.check()
+            raise
+
+    @staticmethod
+    def _slot(
+        deadline: Deadline, priority: str | None
+    ) -> contextlib.AbstractContextManager:
+        if VGMdb.scheduler is None:
+            return contextlib.nullcontext()
+        return VGMdb.scheduler.slot(priority or current_priority(), deadline)
+
+    @staticmethod
+    def parse_page(page: etree._Element, type: VGMdbType) -> VGMdbObject | None:
+        """Parse a detail page.
+
+        Args:
+            page (etree._Element): The page to parse.
+            type (VGMdbType): Type of the object on the page.
+
+        Returns:
+            VGMdbObject | None: The object, None if the page is an error page.
+        """
+        sections = Sections(page)
+        if sections.is_error():
+            return None
+        match type:
+            case VGMdbType.Album:
+                return Album.from_page(page, sections)
+            case VGMdbType.Artist:
+                return Artist.from_page(page, sections)
+            case VGMdbType.Event:
+                return Event.from_page(page, sections)
+            case VGMdbType.Org:
+                return Org.from_page(page, sections)
+            case VGMdbType.Product:
+                return Product.from_page(page, sections)
+
+    @staticmethod
+    def get_album(id: int) -> Album | None:
+        """Get an album from VGMdb.
+
+        Args:
+            id (int): ID of the album.
+
+        Returns:
+            Album | None: The album if found, None otherwise.
+        """
+        return cast(Album | None, VGMdb.get(id, VGMdbType.Album))
+
+    @staticmethod
+    def get_artist(id: int) -> Artist | None:
+        """Get an artist from VGMdb.
+
+        Args:
+            id (int): ID of the artist.
+
+        Returns:
+            Artist | None: The artist if found, None otherwise.
+        """
+        return cast(Artist | None, VGMdb.get(id, VGMdbType.Artist))
+
+    @staticmethod
+    def get_event(id: int) -> Event | None:
+        """Get an event from VGMdb.
+
+        Args:
+            id (int): ID of the event.
+
+        Returns:
+            Event | None: The event if found, None otherwise.
+        """
+        return cast(Event | None, VGMdb.get(id, VGMdbType.Event))
+
+    @staticmethod
+    def get_org(id: int) -> Org | None:
+        """Get an organization from VGMdb.
+
+        Args:
+            id (int): ID of the organization.
+
+        Returns:
+            Org | None: The organization if found, None otherwise.
+        """
+        return cast(Org | None, VGMdb.get(id, VGMdbType.Org))
+
+    @staticmethod
+    def get_product(id: int) -> Product | None:
+        """Get a product from VGMdb.
+
+        Args:
+            id (int): ID of the product.
+
+        Returns:
+            Product | None: The product if found, None otherwise.
+        """
+        return cast(Product | None, VGMdb.get(id, VGMdbType.Product))
+
+    @staticmethod
+    def search(
+        query: str, type: VGMdbType | None = None, timeout: float | None = None
+    ) -> list[VGMdbObject]:
+        """Search for objects on VGMdb.
+
+        Concurrent identical searches share one request, each caller gets
+        its own copy of the results.
+
+        Args:
+            query (str): The search query.
+            type (VGMdbType | None, optional): The type of objects to search for. Defaults to None.
+            timeout (float | None, optional): Deadline in seconds for connecting, reading and parsing. Defaults to `VGMdb.timeout`.
+
+        Raises:
+            DeadlineExceeded: If the search could not be completed in time.
+
+        Returns:
+            list[VGMdbObject]: The list of objects found.
+        """
+        timeout = VGMdb.timeout if timeout is None else timeout
+        priority = current_priority()
+        return VGMdb.singleflight.do(
+            ("search", query, type, priority),
+            lambda: VGMdb.hedger.run(
+                lambda deadline: VGMdb._search(query, type, deadline, priority),
+                Deadline(timeout),
+            ),
+            timeout,
+        )
+
+    @staticmethod
+    async def search_async(
+        query: str, type: VGMdbType | None = None, timeout: float | None = None
+    ) -> list[VGMdbObject]:
+        """Search for objects on VGMdb without blocking the event loop.
+
+        Args:
+            query (str): The search query.
+            type (VGMdbType | None, optional): The type of objects to search for. Defaults to None.
+            timeout (float | None, optional): Deadline in seconds. Defaults to `VGMdb.timeout`.
+
+        Returns:
+            list[VGMdbObject]: The list of objects found.
+        """
+        return await VGMdb.async_singleflight.do(
+            ("search", query, type, current_priority()),
+            lambda: asyncio.to_thread(VGMdb.search, query, type, timeout),
+        )
+
+    @staticmethod
+    def _search(
+        query: str,
+        type: VGMdbType | None,
+        deadline: Deadline,
+        priority: str | None = None,
+    ) -> list[VGMdbObject]:
+        url = f"{VGMdb.base_url}/search?q={query}"
+        if type:
+            url += f"&type={type}"
+        page = VGMdb.fetch_page(url, deadline, priority)
+        if type:
+            return VGMdb.parse_search(page, type)
+        else:
+            result = []
+            for t in VGMdbType:
+                result += VGMdb.parse_search(page, t)
+            return result
+
+    @staticmethod
+    def parse_search(page: etree._Element, type: VGMdbType) -> list[VGMdbObject]:
+        """Parse a search page.
+
+        Args:
+            page (etree._Element): The page to parse.
+            type (VGMdbType): The type of objects to search for.
+
+        Returns:
+            list[VGMdbObject]: The list of objects found.
+        """
+        result = []
+        xpath = f'//div[@id="{type}results"]/table/tbody/tr'
+        match type:
+            case VGMdbType.Album:
+                result += [Album.from_table(i) for i in page.xpath(xpath)]
+            case VGMdbType.Artist:
+                result += [Artist.from_table(i) for i in page.xpath(xpath)]
+            case VGMdbType.Event:
+                result += [Event.from_table(i) for i in page.xpath(xpath)]
+            case VGMdbType.Org:
+                result += [Org.from_table(i) for i in page.xpath(xpath)]
+            case VGMdbType.Product:
+                result += [Product.from_table(i) for i in page.xpath(xpath)]
+        return result
+
+    @staticmethod
+    def search_albums(query: str) -> list[Album]:
+        """Search for albums on VGMdb.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            list[Album]: The list of albums found.
+        """
+        result = VGMdb.search(query, VGMdbType.Album)
+        return [i for i in result if isinstance(i, Album)]
+
+    @staticmethod
+    def search_artists(query: str) -> list[Artist]:
+        """Search for artists on VGMdb.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            list[Artist]: The list of artists found.
+        """
+        result = VGMdb.search(query, VGMdbType.Artist)
+        return [i for i in result if isinstance(i, Artist)]
+
+    @staticmethod
+    def search_events(query: str) -> list[Event]:
+        """Search for events on VGMdb.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            list[Event]: The list of events found.
+        """
+        result = VGMdb.search(query, VGMdbType.Event)
+        return [i for i in result if isinstance(i, Event)]
+
+    @staticmethod
+    def search_orgs(query: str) -> list[Org]:
+        """Search for organizations on VGMdb.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            list[Org]: The list of organizations found.
+        """
+        result = VGMdb.search(query, VGMdbType.Org)
+        return [i for i in result if isinstance(i, Org)]
+
+    @staticmethod
+    def search_products(query: str) -> list[Product]:
+        """Search for products on VGMdb.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            list[Product]: The list of products found.
+        """
+        result = VGMdb.search(query, VGMdbType.Product)
+        return [i for i in result if isinstance(i, Product)]
+
+    @staticmethod
+    def set_session(session: requests.Session) -> None:
+        """Set the session to use for requests.
+
+        Args:
+            session (requests.Session): The session to use.
+        """
+        VGMdb.session = session
+
+    @staticmethod
+    def set_cookies(cookies: dict[str, str]) -> None:
+        """Set the cookies to use for requests.
+
+        Args:
+            cookies (dict[str, str]): The cookies to use.
+        """
+        VGMdb.session.cookies.update(cookies)
+
+    @staticmethod
+    def set_proxy(proxy: str) -> None:
+        """Set the proxy to use for requests.
+
+        Args:
+            proxy (str): The proxy to use.
+        """
+        VGMdb.session.proxies.update({"https": proxy})
+
+    @staticmethod
+    def set_base_url(url: str) -> None:
+        """Send requests to another server, e.g. a mirror or a local stand-in.
+
+        Args:
+            url (str): The scheme and host, such as ``http://127.0.0.1:8000``.
+        """
+        VGMdb.base_url = url.rstrip("/")
+
+    @staticmethod
+    def set_timeout(timeout: float | None) -> None:
+        """Set the default deadline of requests.
+
+        Args:
+            timeout (float | None): Seconds for connecting, reading and parsing, None for no deadline.
+        """
+        VGMdb.timeout = timeout
+
+    @staticmethod
+    def set_hedging(delay: float | None) -> None:
+        """Send a second, duplicate request when a response takes longer than `delay`.
+
+        The first response to arrive is used. How often hedges are sent and
+        win is counted in `VGMdb.hedge_stats`.
+
+        Args:
+            delay (float | None): Seconds to wait before hedging, None to disable hedging.
+        """
+        VGMdb.hedger.delay = delay
+
+    @staticmethod
+    def set_scheduler(scheduler: Scheduler | None) -> None:
+        """Send every request through a scheduler.
+
+        The scheduler keeps all requests within one rate limit and lets
+        requests of urgent classes go first, see `vgmdb.scheduler.priority`.
+
+        Args:
+            scheduler (Scheduler | None): The scheduler, None to send requests right away.
+        """
+        VGMdb.scheduler = scheduler
+
+    @staticmethod
+    def set_archive(archive: ArchiveWriter | None) -> None:
+        """Store the raw page of every fetched object in a page archive.
+
+        Args:
+            archive (ArchiveWriter | None): The archive to add pages to, None to stop archiving.
+        """
+        VGMdb.archive = archive
+
+    @staticmethod
+    def set_snapshot(snapshot: Snapshot | None) -> None:
+        """Answer `VGMdb.get` from a snapshot when it contains the object.
+
+        Args:
+            snapshot (Snapshot | None): The snapshot, None to always fetch.
+        """
+        VGMdb.snapshot = snapshot
+
+    @staticmethod
+    def hedge_stats() -> dict[str, int | float]:
+        """Get statistics about deadlines and hedged requests.
+
+        Returns:
+            dict[str, int | float]: Requests sent, hedges fired and won, deadlines exceeded and the resulting rates.
+        """
+        return VGMdb.hedger.stats.to_dict()
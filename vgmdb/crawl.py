@@ -0,0 +1,489 @@
+from .utils import VGMdbObject, VGMdbType
+from .scheduler import BULK, priority
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+Fetch = Callable[[int], VGMdbObject | None]
+Handle = Callable[[int, VGMdbObject | None], None]
+OnError = Callable[[int, Exception], None]
+
+
+class Lease:
+    """A claim on the IDs ``start`` to ``stop - 1`` of one type.
+
+    ``position`` is the first ID not yet processed, so a lease taken over
+    after its owner died resumes where the owner stopped. ``token`` is
+    increased on every claim and fences off owners whose lease expired.
+    """
+
+    def __init__(
+        self,
+        type: VGMdbType,
+        start: int,
+        stop: int,
+        position: int,
+        owner: str,
+        token: int,
+        expires: float,
+    ) -> None:
+        self.type = type
+        self.start = start
+        self.stop = stop
+        self.position = position
+        self.owner = owner
+        self.token = token
+        self.expires = expires
+
+    def __str__(self) -> str:
+        return f"{self.type}/{self.start}-{self.stop - 1}"
+
+
+class LeaseStore(ABC):
+    """Shared storage of the leases of a crawl."""
+
+    @abstractmethod
+    def create(self, type: VGMdbType, start: int, stop: int, size: int) -> int:
+        """Split the IDs ``start`` to ``stop - 1`` into leases of ``size`` IDs.
+
+        Leases that already exist are kept, so every node may call this.
+
+        Returns:
+            int: The number of leases created.
+        """
+
+    @abstractmethod
+    def claim(self, type: VGMdbType, owner: str, ttl: float) -> Lease | None:
+        """Claim the first lease that is pending or whose owner stopped heartbeating.
+
+        Returns:
+            Lease | None: The claimed lease, None when there is nothing left to do.
+        """
+
+    @abstractmethod
+    def heartbeat(self, lease: Lease, position: int, ttl: float) -> bool:
+        """Extend a lease and record progress.
+
+        Returns:
+            bool: False if the lease expired and was claimed by another owner.
+        """
+
+    @abstractmethod
+    def release(self, lease: Lease) -> bool:
+        """Mark a lease as done.
+
+        Returns:
+            bool: False if the lease expired and was claimed by another owner.
+        """
+
+    @abstractmethod
+    def status(self, type: VGMdbType) -> dict[str, int]:
+        """Count the leases of a type.
+
+        Returns:
+            dict[str, int]: The number of ``pending``, ``leased``, ``expired`` and ``done`` leases.
+        """
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """Leases in an SQLite database, shared by the processes of one machine
+    or by nodes on storage with working file locks.
+
+    Args:
+        path (str | os.PathLike): The database file.
+        timeout (float, optional): Seconds to wait for a lock. Defaults to 30.
+    """
+
+    def __init__(self, path: str | os.PathLike, timeout: float = 30.0) -> None:
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        with self.transaction() as db:
+            db.execute("""CREATE TABLE IF NOT EXISTS leases (
+                    type TEXT NOT NULL,
+                    start INTEGER NOT NULL,
+                    stop INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    owner TEXT,
+                    token INTEGER NOT NULL DEFAULT 0,
+                    expires REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (type, start)
+                )""")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def create(self, type: VGMdbType, start: int, stop: int, size: int) -> int:
+        with self.transaction() as db:
+            rows = [
+                (str(type), i, min(i + size, stop), i) for i in range(start, stop, size)
+            ]
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO leases (type, start, stop, position) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return db.total_changes - before
+
+    def claim(self, type: VGMdbType, owner: str, ttl: float) -> Lease | None:
+        now = time.time()
+        with self.transaction() as db:
+            row = db.execute(
+                "SELECT start, stop, position, token FROM leases WHERE type = ? "
+                "AND (state = 'pending' OR (state = 'leased' AND expires < ?)) "
+                "ORDER BY start LIMIT 1",
+                (str(type), now),
+            ).fetchone()
+            if row is None:
+                return None
+            start, stop, position, token = row
+            db.execute(
+                "UPDATE leases SET state = 'leased', owner = ?, token = ?, "
+                "expires = ? WHERE type = ? AND start = ?",
+                (owner, token + 1, now + ttl, str(type), start),
+            )
+        return Lease(type, start, stop, position, owner, token + 1, now + ttl)
+
+    def heartbeat(self, lease: Lease, position: int, ttl: float) -> bool:
+        expires = time.time() + ttl
+        with self.transaction() as db:
+            updated = db.execute(
+                "UPDATE leases SET expires = ?, position = ? WHERE type = ? "
+                "AND start = ? AND token = ? AND state = 'leased'",
+                (expires, position, str(lease.type), lease.start, lease.token),
+            ).rowcount
+        if updated:
+            lease.expires = expires
+            lease.position = position
+        return bool(updated)
+
+    def release(self, lease: Lease) -> bool:
+        with self.transaction() as db:
+            updated = db.execute(
+                "UPDATE leases SET state = 'done', position = stop, owner = NULL "
+                "WHERE type = ? AND start = ? AND token = ? AND state = 'leased'",
+                (str(lease.type), lease.start, lease.token),
+            ).rowcount
+        return bool(updated)
+
+    def status(self, type: VGMdbType) -> dict[str, int]:
+        now = time.time()
+        result = {"pending": 0, "leased": 0, "expired": 0, "done": 0}
+        with self.transaction() as db:
+            for state, expired, count in db.execute(
+                "SELECT state, state = 'leased' AND expires < ?, COUNT(*) "
+                "FROM leases WHERE type = ? GROUP BY 1, 2",
+                (now, str(type)),
+            ):
+                result["expired" if expired else state] += count
+        return result
+
+
+class FileLeaseStore(LeaseStore):
+    """Leases in a JSON file guarded by an exclusive ``flock``, for shared
+    storage that supports locks but is not suitable for SQLite.
+
+    Args:
+        path (str | os.PathLike): The lease file, a ``.lock`` file is created next to it.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = os.fspath(path)
+
+    @contextmanager
+    def transaction(self) -> Iterator[dict[str, dict]]:
+        import fcntl
+
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        leases = json.load(f)
+                except FileNotFoundError:
+                    leases = {}
+                before = json.dumps(leases, sort_keys=True)
+                yield leases
+                if json.dumps(leases, sort_keys=True) != before:
+                    temp = f"{self.path}.{uuid.uuid4().hex}.tmp"
+                    with open(temp, "w", encoding="utf-8") as f:
+                        json.dump(leases, f)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp, self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def key(type: VGMdbType, start: int) -> str:
+        return f"{type}/{start}"
+
+    def create(self, type: VGMdbType, start: int, stop: int, size: int) -> int:
+        created = 0
+        with self.transaction() as leases:
+            for i in range(start, stop, size):
+                if self.key(type, i) not in leases:
+                    leases[self.key(type, i)] = {
+                        "type": str(type),
+                        "start": i,
+                        "stop": min(i + size, stop),
+                        "position": i,
+                        "state": "pending",
+                        "owner": None,
+                        "token": 0,
+                        "expires": 0.0,
+                    }
+                    created += 1
+        return created
+
+    def claim(self, type: VGMdbType, owner: str, ttl: float) -> Lease | None:
+        now = time.time()
+        with self.transaction() as leases:
+            candidates = [
+                i
+                for i in leases.values()
+                if i["type"] == str(type)
+                and (
+                    i["state"] == "pending"
+                    or (i["state"] == "leased" and i["expires"] < now)
+                )
+            ]
+            if not candidates:
+                return None
+            lease = min(candidates, key=lambda i: i["start"])
+            lease.update(
+                state="leased", owner=owner, token=lease["token"] + 1, expires=now + ttl
+            )
+            return Lease(
+                type,
+                lease["start"],
+                lease["stop"],
+                lease["position"],
+                owner,
+                lease["token"],
+                lease["expires"],
+            )
+
+    def _update(self, lease: Lease, **values) -> bool:
+        with self.transaction() as leases:
+            record = leases.get(self.key(lease.type, lease.start))
+            if not record or record["token"] != lease.token:
+                return False
+            if record["state"] != "leased":
+                return False
+            record.update(values)
+            return True
+
+    def heartbeat(self, lease: Lease, position: int, ttl: float) -> bool:
+        expires = time.time() + ttl
+        if updated := self._update(lease, expires=expires, position=position):
+            lease.expires = expires
+            lease.position = position
+        return updated
+
+    def release(self, lease: Lease) -> bool:
+        return self._update(lease, state="done", position=lease.stop, owner=None)
+
+    def status(self, type: VGMdbType) -> dict[str, int]:
+        now = time.time()
+        result = {"pending": 0, "leased": 0, "expired": 0, "done": 0}
+        with self.transaction() as leases:
+            for lease in leases.values():
+                if lease["type"] != str(type):
+                    continue
+                if lease["state"] == "leased" and lease["expires"] < now:
+                    result["expired"] += 1
+                else:
+                    result[lease["state"]] += 1
+        return result
+
+
+def open_store(path: str | os.PathLike) -> LeaseStore:
+    """Open a lease store, SQLite for ``.db``, ``.sqlite`` and ``.sqlite3`` files,
+    a JSON lease file otherwise.
+
+    Args:
+        path (str | os.PathLike): The path of the store.
+
+    Returns:
+        LeaseStore: The store.
+    """
+    if os.fspath(path).endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteLeaseStore(path)
+    return FileLeaseStore(path)
+
+
+def fetch_object(type: VGMdbType) -> Fetch:
+    def fetch(id: int) -> VGMdbObject | None:
+        from .client import VGMdb
+
+        with priority(BULK):
+            return VGMdb.get(id, type)
+
+    return fetch
+
+
+class CrawlWorker:
+    """Claims leases and processes their IDs until none are left.
+
+    A background thread heartbeats the current lease and records progress.
+    If the lease is lost, e.g. after a long pause, the worker abandons it to
+    the new owner. An ID whose fetch or handling still raises after
+    `retries` more attempts is passed to `error` and skipped, so one broken
+    page cannot stall the crawl. If `error` raises, the lease is left to
+    expire and is resumed by another worker from the last recorded position.
+
+    Args:
+        store (LeaseStore): The shared lease store.
+        type (VGMdbType): The type of objects to crawl.
+        handle (Handle): Called with every ID and the fetched object, None if it does not exist.
+        fetch (Fetch | None, optional): Fetches an object by ID. Defaults to `VGMdb.get` as bulk traffic.
+        ttl (float, optional): Seconds a lease stays valid without a heartbeat. Defaults to 60.
+        owner (str | None, optional): Name of the worker. Defaults to host, process and a random suffix.
+        error (OnError | None, optional): Called with every ID that failed and its last error. Defaults to None.
+        retries (int, optional): Attempts after the first for an ID that fails. Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        type: VGMdbType,
+        handle: Handle,
+        fetch: Fetch | None = None,
+        ttl: float = 60.0,
+        owner: str | None = None,
+        error: OnError | None = None,
+        retries: int = 2,
+    ) -> None:
+        self.store = store
+        self.type = type
+        self.handle = handle
+        self.fetch = fetch or fetch_object(type)
+        self.ttl = ttl
+        self.owner = (
+            owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.error = error
+        self.retries = retries
+        self.processed = 0
+        self.failed = 0
+
+    def run(self) -> int:
+        """Process leases until the ID space is exhausted.
+
+        Returns:
+            int: The number of IDs processed by this worker, including the ones that failed.
+        """
+        while lease := self.store.claim(self.type, self.owner, self.ttl):
+            self.work(lease)
+        return self.processed
+
+    def work(self, lease: Lease) -> bool:
+        """Process the IDs of a lease.
+
+        Args:
+            lease (Lease): The claimed lease.
+
+        Returns:
+            bool: True if the lease was completed, False if it was lost.
+        """
+        position = lease.position
+        stopped = threading.Event()
+        lost = threading.Event()
+
+        def heartbeat() -> None:
+            while not stopped.wait(self.ttl / 3):
+                if not self.store.heartbeat(lease, position, self.ttl):
+                    lost.set()
+                    return
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        try:
+            for id in range(lease.position, lease.stop):
+                if lost.is_set():
+                    return False
+                self._process(id)
+                position = id + 1
+                self.processed += 1
+        finally:
+            stopped.set()
+            thread.join()
+        return self.store.release(lease)
+
+    def _process(self, id: int) -> None:
+        for _ in range(self.retries + 1):
+            try:
+                self.handle(id, self.fetch(id))
+                return
+            except Exception as e:
+                error = e
+        self.failed += 1
+        if self.error is not None:
+            self.error(id, error)
+
+
+def _run_worker(
+    store: LeaseStore,
+    type: VGMdbType,
+    handle: Handle,
+    fetch: Fetch | None,
+    ttl: float,
+    error: OnError | None,
+) -> int:
+    return CrawlWorker(store, type, handle, fetch, ttl, error=error).run()
+
+
+def run_workers(
+    store: LeaseStore,
+    type: VGMdbType,
+    handle: Handle,
+    workers: int,
+    fetch: Fetch | None = None,
+    ttl: float = 60.0,
+    error: OnError | None = None,
+) -> int:
+    """Run crawl workers in local processes, each standing in for a node.
+
+    ``store``, ``handle``, ``fetch`` and ``error`` must be picklable, e.g.
+    module level functions.
+
+    Args:
+        store (LeaseStore): The shared lease store.
+        type (VGMdbType): The type of objects to crawl.
+        handle (Handle): Called with every ID and the fetched object.
+        workers (int): The number of processes.
+        fetch (Fetch | None, optional): Fetches an object by ID. Defaults to `VGMdb.get` as bulk traffic.
+        ttl (float, optional): Seconds a lease stays valid without a heartbeat. Defaults to 60.
+        error (OnError | None, optional): Called with every ID that failed and its last error. Defaults to None.
+
+    Returns:
+        int: The number of IDs processed, including the ones that failed.
+    """
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(_run_worker, store, type, handle, fetch, ttl, error)
+            for _ in range(workers)
+        ]
+        return sum(future.result() for future in futures)
@@ -0,0 +1,172 @@
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, TypeVar
+import threading
+import time
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request does not complete before its deadline."""
+
+
+class Deadline:
+    """A point in time by which a request has to be complete.
+
+    Args:
+        timeout (float | None): Seconds from now, None for no deadline.
+    """
+
+    def __init__(self, timeout: float | None) -> None:
+        self.timeout = timeout
+        self.at = time.monotonic() + timeout if timeout is not None else None
+
+    def remaining(self) -> float | None:
+        """Get the time left.
+
+        Returns:
+            float | None: Seconds left, None if there is no deadline.
+        """
+        if self.at is None:
+            return None
+        return max(self.at - time.monotonic(), 0.0)
+
+    def check(self) -> None:
+        """Raise if the deadline has passed.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed.
+        """
+        if self.at is not None and time.monotonic() >= self.at:
+            raise DeadlineExceeded(f"Deadline of {self.timeout}s exceeded")
+
+
+class HedgeStats:
+    """Counters of how often hedged requests were sent and won."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.deadlines_exceeded = 0
+
+    def add(self, **counts: int) -> None:
+        with self.lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def to_dict(self) -> dict[str, int | float]:
+        """Get a snapshot of the counters.
+
+        Returns:
+            dict[str, int | float]: The counters and the rates of hedges fired and won.
+        """
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "deadlines_exceeded": self.deadlines_exceeded,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+                "hedge_win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+            }
+
+
+class Hedger:
+    """Runs requests with a deadline, sending one duplicate for slow requests.
+
+    Args:
+        delay (float | None, optional): Seconds to wait for the first attempt before sending a hedge, None to disable hedging. Defaults to None.
+    """
+
+    def __init__(self, delay: float | None = None) -> None:
+        self.delay = delay
+        self.stats = HedgeStats()
+
+    @staticmethod
+    def start(attempt: Callable[[Deadline], T], deadline: Deadline) -> Future:
+        """Run an attempt on a thread of its own.
+
+        A shared pool would cap the callers' concurrency, queue hedges
+        behind first attempts and stay occupied by abandoned attempts.
+
+        Args:
+            attempt (Callable[[Deadline], T]): Sends the request and parses the response.
+            deadline (Deadline): The deadline of the request.
+
+        Returns:
+            Future: The result of the attempt.
+        """
+        future: Future = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(attempt(deadline))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="vgmdb-attempt", daemon=True).start()
+        return future
+
+    def run(self, attempt: Callable[[Deadline], T], deadline: Deadline) -> T:
+        """Run an attempt, hedging it if it is slow.
+
+        Without hedging the attempt runs in the calling thread and is
+        expected to respect the deadline itself. With hedging, each attempt
+        runs on a thread of its own and the first successful one wins; a
+        failure is only raised once no attempt is left running. Abandoned
+        attempts end by themselves at the deadline.
+
+        Args:
+            attempt (Callable[[Deadline], T]): Sends the request and parses the response.
+            deadline (Deadline): The deadline of the request.
+
+        Raises:
+            DeadlineExceeded: If no attempt completes before the deadline.
+
+        Returns:
+            T: The result of the first successful attempt.
+        """
+        self.stats.add(requests=1)
+        if self.delay is None:
+            try:
+                result = attempt(deadline)
+                deadline.check()
+                return result
+            except DeadlineExceeded:
+                self.stats.add(deadlines_exceeded=1)
+                raise
+        pending: set[Future] = {self.start(attempt, deadline)}
+        hedge: Future | None = None
+        hedge_at = time.monotonic() + self.delay
+        error: BaseException | None = None
+        while pending:
+            timeouts = [deadline.remaining()]
+            if hedge is None:
+                timeouts.append(max(hedge_at - time.monotonic(), 0.0))
+            timeout = min((i for i in timeouts if i is not None), default=None)
+            done, pending = wait(pending, timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.stats.add(hedge_wins=1)
+                    return future.result()
+                error = future.exception()
+            if error is not None and hedge is None:
+                break  # failed before it was slow enough to hedge
+            if deadline.remaining() == 0.0:
+                self.stats.add(deadlines_exceeded=1)
+                raise DeadlineExceeded(f"Deadline of {deadline.timeout}s exceeded")
+            if hedge is None and time.monotonic() >= hedge_at:
+                hedge = self.start(attempt, deadline)
+                pending.add(hedge)
+                self.stats.add(hedges=1)
+        if isinstance(error, DeadlineExceeded):
+            self.stats.add(deadlines_exceeded=1)
+        raise error  # type: ignore[misc]
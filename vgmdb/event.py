@@ -1,15 +1,42 @@
-from .utils import VGMdbObject, VGMdbType
+from __future__ import annotations
 
-from lxml import etree
+from .utils import VGMdbObject, VGMdbType, Link, Picture, parse_date
+from .sections import Sections, set_details, text
+
+from typing import TYPE_CHECKING
+import datetime
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+    from .album import Album
 
 
 class Event(VGMdbObject):
     type: VGMdbType = VGMdbType.Event
+    start_date: datetime.date | None = None
+    end_date: datetime.date | None = None
+
+    # details
+    picture: Picture | None
+    info: dict[str, str]
+    notes: str
+    albums: list[Album]
 
     @staticmethod
     def from_table(element: etree._Element) -> "Event":
         return Event(-1)  # TODO
 
     @staticmethod
-    def from_page(page) -> "Event":
-        return Event(-1)  # TODO
+    def from_page(page: etree._Element, sections: Sections | None = None) -> "Event":
+        sections = sections or Sections(page)
+        event = Event(Link.from_element(sections.link).id)
+        for label, value in set_details(event, sections).items():
+            if label in ("Date", "Dates", "Event Date"):
+                dates = [i.strip() for i in text(value).split(" - ")]
+                try:
+                    event.start_date = parse_date(dates[0])
+                    event.end_date = parse_date(dates[-1])
+                except ValueError:
+                    pass
+        return event
@@ -0,0 +1,316 @@
+from .album import Album
+from .utils import Name, Track
+
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+from enum import Enum
+import datetime
+import os
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+EPOCH = datetime.date(1970, 1, 1)
+
+CREDIT_FIELDS = ["composer", "arranger", "performer", "lyricist", "other_staff"]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for columnar export, install it with `pip install vgmdb[arrow]`"
+        )
+    return pyarrow
+
+
+def day_number(date: datetime.date | None) -> int | None:
+    """Convert a date to the number of days since 1970-01-01.
+
+    Args:
+        date (datetime.date | None): The date to convert.
+
+    Returns:
+        int | None: The day number, None if the date is unknown.
+    """
+    if date is None:
+        return None
+    return (date - EPOCH).days
+
+
+def seconds(length: datetime.timedelta | None) -> int | None:
+    """Convert a duration to integer seconds.
+
+    Args:
+        length (datetime.timedelta | None): The duration to convert.
+
+    Returns:
+        int | None: The number of seconds, None if the duration is unknown.
+    """
+    if length is None:
+        return None
+    return int(length.total_seconds())
+
+
+def category(value: Enum | str | None) -> str | None:
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def _schemas(pa) -> dict[str, "pa.Schema"]:
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    name = [
+        ("name_en", pa.string()),
+        ("name_ja", pa.string()),
+        ("name_ja_latn", pa.string()),
+    ]
+    return {
+        "albums": pa.schema(
+            [
+                ("album_id", pa.int32()),
+                *name,
+                ("catalog", pa.string()),
+                ("category", dictionary),
+                ("child_album", pa.bool_()),
+                ("release_date", pa.date32()),
+                ("media_format", dictionary),
+                ("publish_format", dictionary),
+                ("barcode", pa.int64()),
+                ("price", pa.int64()),
+                ("currency", dictionary),
+                ("classification", pa.list_(dictionary)),
+                ("discs", pa.int16()),
+                ("length", pa.int32()),
+            ]
+        ),
+        "discs": pa.schema(
+            [
+                ("album_id", pa.int32()),
+                ("disc", pa.int16()),
+                ("catalog", pa.string()),
+                ("type", dictionary),
+                ("tracks", pa.int16()),
+                ("length", pa.int32()),
+            ]
+        ),
+        "tracks": pa.schema(
+            [
+                ("album_id", pa.int32()),
+                ("disc", pa.int16()),
+                ("index", pa.int16()),
+                ("subindex", pa.int16()),
+                *name,
+                ("length", pa.int32()),
+            ]
+        ),
+        "credits": pa.schema(
+            [
+                ("album_id", pa.int32()),
+                ("credit", dictionary),
+                ("role", dictionary),
+                ("artist_id", pa.int32()),
+                *name,
+            ]
+        ),
+    }
+
+
+def _name(name: Name | None) -> tuple[str | None, str | None, str | None]:
+    if name is None:
+        return (None, None, None)
+    return (name.en, name.ja, name.ja_latn)
+
+
+class ColumnBuilder:
+    """Accumulates album rows as plain Python columns.
+
+    Rows are appended table by table, so memory use is bounded by the batch
+    size instead of the number of albums exported.
+    """
+
+    def __init__(self) -> None:
+        self.schemas = _schemas(_require_pyarrow())
+        self.columns: dict[str, dict[str, list[Any]]] = {}
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.columns["albums"]["album_id"])
+
+    def clear(self) -> None:
+        self.columns = {
+            table: {name: [] for name in schema.names}
+            for table, schema in self.schemas.items()
+        }
+
+    def _append(self, table: str, *row: Any) -> None:
+        for column, value in zip(self.columns[table].values(), row, strict=True):
+            column.append(value)
+
+    def add(self, album: Album) -> None:
+        """Add an album and its discs, tracks and credits.
+
+        Args:
+            album (Album): The album to add.
+        """
+        tracklist = getattr(album, "tracklist", [])
+        price = getattr(album, "price", None)
+        lengths = [seconds(getattr(disc, "length", None)) for disc in tracklist]
+        self._append(
+            "albums",
+            album.id,
+            *_name(album.name),
+            album.catalog,
+            category(album.category),
+            album.child_album,
+            day_number(album.release_date),
+            getattr(album, "media_format", None),
+            getattr(album, "publish_format", None),
+            getattr(album, "barcode", None),
+            price[0] if price and price[0] >= 0 else None,
+            price[1] if price and price[0] >= 0 else None,
+            getattr(album, "classification", None),
+            len(tracklist) or None,
+            sum(lengths) if lengths and None not in lengths else None,
+        )
+        for disc in tracklist:
+            tracks: list[Track] = getattr(disc, "tracks", [])
+            self._append(
+                "discs",
+                album.id,
+                disc.disc,
+                disc.catalog,
+                disc.type,
+                len(tracks),
+                seconds(getattr(disc, "length", None)),
+            )
+            for track in tracks:
+                self._add_track(album.id, disc.disc, track, None)
+                for subtrack in getattr(track, "subtracks", []):
+                    self._add_track(album.id, disc.disc, subtrack, track.index)
+        for credit in CREDIT_FIELDS:
+            for artist in getattr(album, credit, []):
+                self._append(
+                    "credits",
+                    album.id,
+                    credit,
+                    getattr(artist, "role", None),
+                    artist.id if artist.id >= 0 else None,
+                    *_name(artist.name),
+                )
+
+    def _add_track(
+        self, album_id: int, disc: int, track: Track, parent: int | None
+    ) -> None:
+        self._append(
+            "tracks",
+            album_id,
+            disc,
+            parent if parent is not None else track.index,
+            track.index if parent is not None else None,
+            *_name(getattr(track, "title", None)),
+            seconds(getattr(track, "length", None)),
+        )
+
+    def to_arrow(self) -> dict[str, "pa.RecordBatch"]:
+        """Convert the accumulated rows to Arrow record batches.
+
+        Returns:
+            dict[str, pa.RecordBatch]: One record batch per table.
+        """
+        pa = _require_pyarrow()
+        batches = {}
+        for table, schema in self.schemas.items():
+            arrays = [
+                _array(pa, self.columns[table][field.name], field.type)
+                for field in schema
+            ]
+            batches[table] = pa.RecordBatch.from_arrays(arrays, schema=schema)
+        return batches
+
+
+def _array(pa, values: list[Any], type: "pa.DataType") -> "pa.Array":
+    if pa.types.is_dictionary(type):
+        return pa.array(values, pa.string()).dictionary_encode().cast(type)
+    if pa.types.is_list(type) and pa.types.is_dictionary(type.value_type):
+        return pa.array(values, pa.list_(pa.string())).cast(type)
+    if pa.types.is_date32(type):
+        return pa.array(values, pa.int32()).cast(type)
+    return pa.array(values, type)
+
+
+def iter_batches(
+    albums: Iterable[Album], batch_size: int = 1000
+) -> Iterator[dict[str, "pa.RecordBatch"]]:
+    """Export albums as a stream of Arrow record batches.
+
+    Args:
+        albums (Iterable[Album]): The albums to export, consumed lazily.
+        batch_size (int, optional): Number of albums per batch. Defaults to 1000.
+
+    Yields:
+        dict[str, pa.RecordBatch]: Record batches for the albums, discs, tracks and credits tables.
+    """
+    builder = ColumnBuilder()
+    for album in albums:
+        builder.add(album)
+        if len(builder) >= batch_size:
+            yield builder.to_arrow()
+            builder.clear()
+    if len(builder):
+        yield builder.to_arrow()
+
+
+def to_arrow(albums: Iterable[Album]) -> dict[str, "pa.Table"]:
+    """Export albums to in-memory Arrow tables.
+
+    Args:
+        albums (Iterable[Album]): The albums to export.
+
+    Returns:
+        dict[str, pa.Table]: The albums, discs, tracks and credits tables.
+    """
+    pa = _require_pyarrow()
+    schemas = _schemas(pa)
+    batches: dict[str, list] = {table: [] for table in schemas}
+    for batch in iter_batches(albums):
+        for table, record_batch in batch.items():
+            batches[table].append(record_batch)
+    return {
+        table: pa.Table.from_batches(batches[table], schema=schema)
+        for table, schema in schemas.items()
+    }
+
+
+def write_parquet(
+    albums: Iterable[Album], directory: str | os.PathLike, batch_size: int = 1000
+) -> dict[str, str]:
+    """Export albums to one Parquet file per table, one batch at a time.
+
+    Args:
+        albums (Iterable[Album]): The albums to export, consumed lazily.
+        directory (str | os.PathLike): The directory to write the files to.
+        batch_size (int, optional): Number of albums per row group. Defaults to 1000.
+
+    Returns:
+        dict[str, str]: The path of the file written for each table.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    os.makedirs(directory, exist_ok=True)
+    schemas = _schemas(pa)
+    paths = {table: os.path.join(directory, f"{table}.parquet") for table in schemas}
+    writers = {
+        table: pq.ParquetWriter(paths[table], schema)
+        for table, schema in schemas.items()
+    }
+    try:
+        for batch in iter_batches(albums, batch_size):
+            for table, record_batch in batch.items():
+                writers[table].write_batch(record_batch)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
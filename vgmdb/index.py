@@ -0,0 +1,330 @@
+from .utils import VGMdbObject, VGMdbType, Name
+from .album import Album
+from .artist import Artist
+from .event import Event
+from .org import Org
+from .product import Product
+
+from bisect import bisect_left, insort
+import copy
+import math
+import re
+import threading
+import unicodedata
+
+
+TYPES: dict[VGMdbType, type[VGMdbObject]] = {
+    VGMdbType.Album: Album,
+    VGMdbType.Artist: Artist,
+    VGMdbType.Event: Event,
+    VGMdbType.Org: Org,
+    VGMdbType.Product: Product,
+}
+
+# Attributes copied to the stubs returned by a search, mirroring what
+# `VGMdb.parse_search` fills in from the search result tables.
+STUB_ATTRIBUTES: dict[VGMdbType, list[str]] = {
+    VGMdbType.Album: [
+        "catalog",
+        "category",
+        "child_album",
+        "release_date",
+        "media_format",
+        "picture",
+    ],
+    VGMdbType.Artist: ["aliases"],
+    VGMdbType.Org: ["aliases"],
+    VGMdbType.Product: ["category", "release_date"],
+    VGMdbType.Event: [],
+}
+
+FIELD_WEIGHTS = {"name": 1.0, "alias": 0.7, "catalog": 1.5}
+
+# Latin prefixes shorter than this only match whole words, and a prefix
+# matches at most this many terms, so short input stays cheap.
+MIN_PREFIX = 2
+MAX_EXPANSIONS = 64
+
+CJK = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Normalize text for indexing.
+
+    Applies NFKC (so full-width Latin and half-width kana fold to their
+    usual forms), case folding and removal of diacritics.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The normalized text.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = unicodedata.normalize("NFD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return unicodedata.normalize("NFC", text)
+
+
+def tokenize(text: str, n: int = 2, tails: bool = False) -> list[str]:
+    """Split text into index terms.
+
+    Japanese runs (kana and kanji) become overlapping character n-grams,
+    everything else becomes normalized word tokens.
+
+    Args:
+        text (str): The text to tokenize.
+        n (int, optional): The n-gram size for Japanese text. Defaults to 2.
+        tails (bool, optional): Also add the suffixes shorter than n of longer Japanese runs, so that every character starts a term. Defaults to False.
+
+    Returns:
+        list[str]: The terms, in order of appearance.
+    """
+    text = normalize(text)
+    terms = []
+    position = 0
+    for m in CJK.finditer(text):
+        terms += WORD.findall(text[position : m.start()])
+        run = m.group()
+        if len(run) <= n:
+            terms.append(run)
+        else:
+            terms += [run[i : i + n] for i in range(len(run) - n + 1)]
+            if tails:
+                terms += [run[-i:] for i in range(n - 1, 0, -1)]
+        position = m.end()
+    terms += WORD.findall(text[position:])
+    return terms
+
+
+def compact(text: str) -> str:
+    """Collapse a catalog number to its letters and digits, e.g. ``SQEX10001``.
+
+    Args:
+        text (str): The catalog number.
+
+    Returns:
+        str: The collapsed catalog number.
+    """
+    return "".join(WORD.findall(normalize(text)))
+
+
+class NameIndex:
+    """Offline full-text index over names, aliases and catalog numbers.
+
+    Objects can be added at any time, e.g. every album right after it is
+    parsed, and searched without a round-trip to VGMdb. Searches return
+    stubs like the ones produced by `VGMdb.parse_search`.
+    """
+
+    def __init__(self, n: int = 2, k1: float = 1.2) -> None:
+        self.n = n
+        self.k1 = k1
+        self.postings: dict[str, dict[tuple[VGMdbType, int], float]] = {}
+        self.documents: dict[tuple[VGMdbType, int], dict[str, float]] = {}
+        self.lengths: dict[tuple[VGMdbType, int], float] = {}
+        self.names: dict[tuple[VGMdbType, int], set[str]] = {}
+        self.stubs: dict[tuple[VGMdbType, int], VGMdbObject] = {}
+        self.total_length = 0.0
+        # every indexed term, kept sorted for prefix lookups; new terms are
+        # inserted into the short `recent` list, which is merged into `terms`
+        # once it grows past a fraction of it
+        self.terms: list[str] = []
+        self.recent: list[str] = []
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, obj: VGMdbObject) -> bool:
+        return (obj.type, obj.id) in self.documents
+
+    def _fields(self, obj: VGMdbObject) -> list[tuple[str, str]]:
+        fields = []
+        for value in [obj.name.en, obj.name.ja, obj.name.ja_latn]:
+            if value:
+                fields.append(("name", value))
+        for alias in getattr(obj, "aliases", None) or []:
+            if alias:
+                fields.append(("alias", alias))
+        if catalog := getattr(obj, "catalog", None):
+            fields.append(("catalog", catalog))
+        return fields
+
+    def _stub(self, obj: VGMdbObject) -> VGMdbObject:
+        stub = TYPES[obj.type](obj.id)
+        stub.name = Name(obj.name.en, obj.name.ja, obj.name.ja_latn)
+        stub.link = obj.link
+        for attribute in STUB_ATTRIBUTES[obj.type]:
+            if hasattr(obj, attribute):
+                setattr(stub, attribute, copy.copy(getattr(obj, attribute)))
+        return stub
+
+    def add(self, obj: VGMdbObject, replace: bool = True) -> None:
+        """Add an object to the index, replacing a previous entry with the same ID.
+
+        Objects without an ID (unlinked artists) are ignored.
+
+        Args:
+            obj (VGMdbObject): The object to add.
+            replace (bool, optional): Replace a previous entry, keep it otherwise. Defaults to True.
+        """
+        if obj.id < 0:
+            return
+        key = (obj.type, obj.id)
+        terms: dict[str, float] = {}
+        names = set()
+        for field, value in self._fields(obj):
+            weight = FIELD_WEIGHTS[field]
+            for term in tokenize(value, self.n, tails=True):
+                terms[term] = terms.get(term, 0.0) + weight
+            if field == "catalog":
+                term = compact(value)
+                terms[term] = terms.get(term, 0.0) + weight
+            names.add(normalize(value))
+        with self.lock:
+            if not replace and key in self.documents:
+                return
+            self.remove(obj)
+            for term, weight in terms.items():
+                if term not in self.postings:
+                    self.postings[term] = {}
+                    self._add_term(term)
+                self.postings[term][key] = weight
+            self.documents[key] = terms
+            self.lengths[key] = sum(terms.values())
+            self.names[key] = names
+            self.stubs[key] = self._stub(obj)
+            self.total_length += self.lengths[key]
+
+    def add_album(self, album: Album) -> None:
+        """Add an album together with the artists, organizations and related
+        albums it references.
+
+        Args:
+            album (Album): The parsed album.
+        """
+        self.add(album)
+        for attribute in [
+            "composer",
+            "arranger",
+            "performer",
+            "lyricist",
+            "other_staff",
+            "label",
+            "publisher",
+            "manufacturer",
+            "distributor",
+            "phonographic_copyright",
+            "related_albums",
+        ]:
+            for obj in getattr(album, attribute, None) or []:
+                # references are stubs, never replace a full entry with them
+                self.add(obj, replace=False)
+
+    def remove(self, obj: VGMdbObject) -> None:
+        """Remove an object from the index.
+
+        Args:
+            obj (VGMdbObject): The object to remove.
+        """
+        key = (obj.type, obj.id)
+        with self.lock:
+            terms = self.documents.pop(key, None)
+            if terms is None:
+                return
+            for term in terms:
+                postings = self.postings[term]
+                del postings[key]
+                if not postings:
+                    del self.postings[term]
+                    self._remove_term(term)
+            del self.names[key]
+            del self.stubs[key]
+            self.total_length -= self.lengths.pop(key)
+
+    def _add_term(self, term: str) -> None:
+        insort(self.recent, term)
+        if len(self.recent) > max(1024, len(self.terms) // 32):
+            # two sorted runs, merged by timsort in linear time
+            self.terms = sorted(self.terms + self.recent)
+            self.recent = []
+
+    def _remove_term(self, term: str) -> None:
+        for terms in (self.recent, self.terms):
+            i = bisect_left(terms, term)
+            if i < len(terms) and terms[i] == term:
+                del terms[i]
+                return
+
+    def _expand(self, term: str) -> list[str]:
+        expanded = []
+        for terms in (self.terms, self.recent):
+            i = bisect_left(terms, term)
+            stop = min(i + MAX_EXPANSIONS, len(terms))
+            while i < stop and terms[i].startswith(term):
+                expanded.append(terms[i])
+                i += 1
+        return sorted(expanded)[:MAX_EXPANSIONS]
+
+    def search(
+        self, query: str, type: VGMdbType | None = None, limit: int | None = 50
+    ) -> list[VGMdbObject]:
+        """Search the index.
+
+        Results are ranked with BM25 over the query terms; exact name matches
+        come first. The last word of a Latin query also matches as a prefix if
+        it has at least `MIN_PREFIX` characters, so partial input finds
+        results, and so do Japanese terms shorter than the n-gram size, e.g. a
+        single kanji. A prefix matches at most `MAX_EXPANSIONS` terms.
+
+        Args:
+            query (str): The search query.
+            type (VGMdbType | None, optional): The type of objects to search for. Defaults to None.
+            limit (int | None, optional): The maximum number of results. Defaults to 50.
+
+        Returns:
+            list[VGMdbObject]: The list of objects found, best match first.
+        """
+        words = tokenize(query, self.n)
+        terms = {term: [term] for term in words}
+        if len(words) > 1:
+            terms[compact(query)] = [compact(query)]
+        normalized = normalize(query.strip())
+        scores: dict[tuple[VGMdbType, int], float] = {}
+        with self.lock:
+            if not self.documents:
+                return []
+            if words and len(words[-1]) >= MIN_PREFIX and not CJK.fullmatch(words[-1]):
+                terms[words[-1]] = self._expand(words[-1]) or [words[-1]]
+            for word in words:
+                if len(word) < self.n and CJK.fullmatch(word):
+                    terms[word] = self._expand(word) or [word]
+            average = self.total_length / len(self.documents)
+            for term, matches in terms.items():
+                for match in matches:
+                    postings = self.postings.get(match)
+                    if not postings:
+                        continue
+                    idf = math.log(
+                        1
+                        + (len(self.documents) - len(postings) + 0.5)
+                        / (len(postings) + 0.5)
+                    )
+                    if match != term:
+                        idf *= 0.5
+                    for key, weight in postings.items():
+                        if type and key[0] != type:
+                            continue
+                        norm = 0.25 + 0.75 * self.lengths[key] / average
+                        scores[key] = scores.get(key, 0.0) + idf * weight * (
+                            self.k1 + 1
+                        ) / (weight + self.k1 * norm)
+            for key in scores:
+                if normalized in self.names[key]:
+                    scores[key] += 100.0
+            ranked = sorted(scores, key=lambda key: (-scores[key], key[0].value, key[1]))
+            if limit is not None:
+                ranked = ranked[:limit]
+            return [copy.deepcopy(self.stubs[key]) for key in ranked]
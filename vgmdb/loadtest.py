@@ -0,0 +1,526 @@
+"""Load test of the client against a local stand-in for VGMdb.
+
+Saved pages are served by a local HTTP server with configurable latency,
+bandwidth and errors while the client is driven at several concurrency
+levels. The report is JSON and records the client version and commit, so
+reports of two releases can be diffed::
+
+    python -m vgmdb.loadtest --pages tests/data --concurrency 1,8,32 \\
+        --duration 30 --latency 0.05 --bandwidth 2000000 -o report.json
+"""
+
+from .utils import Link, VGMdbType
+
+from typing import Any, Callable, Iterable
+from urllib.parse import urlsplit
+import argparse
+import http.server
+import importlib.metadata
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+
+
+class Profile:
+    """How the stand-in server responds.
+
+    Args:
+        latency (float, optional): Seconds before the response starts. Defaults to 0.
+        jitter (float, optional): Up to this many seconds are added to the latency at random. Defaults to 0.
+        bandwidth (float | None, optional): Bytes per second of each response body, None for no limit. Defaults to None.
+        error_rate (float, optional): Fraction of requests answered with 503 Service Unavailable. Defaults to 0.
+        seed (int | None, optional): Seed of the random jitter and errors. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bandwidth: float | None = None,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+    def error(self) -> bool:
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def to_dict(self) -> dict[str, float | None]:
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "bandwidth": self.bandwidth,
+            "error_rate": self.error_rate,
+        }
+
+
+def load_pages(path: str | os.PathLike) -> dict[VGMdbType, list[bytes]]:
+    """Load saved pages from a directory of ``.html`` files or a page archive.
+
+    The type of a saved page is taken from the canonical link in its head,
+    pages without one, such as search results, are skipped.
+
+    Args:
+        path (str | os.PathLike): The directory or archive.
+
+    Returns:
+        dict[VGMdbType, list[bytes]]: The pages by type.
+    """
+    from .archive import Archive, parse_html
+    from .sections import Sections
+
+    pages: dict[VGMdbType, list[bytes]] = {}
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.endswith(".html"):
+                continue
+            with open(os.path.join(path, name), "rb") as f:
+                content = f.read()
+            sections = Sections(parse_html(content))
+            if sections.link is None or sections.is_error():
+                continue
+            try:
+                link = Link.from_element(sections.link)
+            except ValueError:
+                continue
+            pages.setdefault(link.type, []).append(content)
+    else:
+        with Archive(path) as archive:
+            for link, content in archive:
+                pages.setdefault(link.type, []).append(content)
+    return pages
+
+
+def load_search_page(path: str | os.PathLike) -> bytes | None:
+    """Load the saved search results page ``search.html`` of a directory of pages.
+
+    Args:
+        path (str | os.PathLike): The directory or archive of saved pages.
+
+    Returns:
+        bytes | None: The page, None if there is none.
+    """
+    try:
+        with open(os.path.join(path, "search.html"), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """Serves saved pages for ``/<type>/<id>`` and ``/search``.
+
+    Any ID of a type with saved pages is served, cycling through the saved
+    pages by ID, and every search is answered with the saved search page.
+    Connections are kept alive, and the number of connections accepted is
+    counted to measure connection reuse.
+
+    Args:
+        pages (dict[VGMdbType, list[bytes]]): The saved pages by type.
+        profile (Profile): How to respond.
+        search_page (bytes | None, optional): The saved search results page, None to answer searches with 404. Defaults to None.
+        address (tuple[str, int], optional): Where to listen. Defaults to a free port on localhost.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        pages: dict[VGMdbType, list[bytes]],
+        profile: Profile,
+        search_page: bytes | None = None,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+    ) -> None:
+        super().__init__(address, StandInHandler)
+        self.pages = pages
+        self.search_page = search_page
+        self.profile = profile
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, path: str) -> bytes | None:
+        if path == "/search":
+            return self.search_page
+        try:
+            link = Link.from_url(path)
+        except ValueError:
+            return None
+        if not (pages := self.pages.get(link.type)):
+            return None
+        return pages[link.id % len(pages)]
+
+    def __enter__(self) -> "StandInServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes, which Nagle would hold back
+    disable_nagle_algorithm = True
+    server: StandInServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        profile = self.server.profile
+        time.sleep(profile.delay())
+        body = self.server.page(urlsplit(self.path).path)
+        if body is None or profile.error():
+            status = 404 if body is None else 503
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        chunk_size = 16 * 1024
+        for i in range(0, len(body), chunk_size):
+            chunk = body[i : i + chunk_size]
+            self.wfile.write(chunk)
+            if profile.bandwidth:
+                time.sleep(len(chunk) / profile.bandwidth)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def rss() -> int | None:
+    """Get the resident set size of this process.
+
+    Returns:
+        int | None: Bytes in memory, the peak where the current size is unavailable, None if neither is.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values: list[float], p: float) -> float | None:
+    """Get a percentile by the nearest-rank method.
+
+    Args:
+        values (list[float]): Sorted values.
+        p (float): The percentile, 0 to 100.
+
+    Returns:
+        float | None: The value, None if there are no values.
+    """
+    if not values:
+        return None
+    rank = math.ceil(len(values) * p / 100) - 1
+    return values[min(max(rank, 0), len(values) - 1)]
+
+
+SCENARIOS = ["get", "search", "fetch", "crawl"]
+
+
+def scenario(name: str, ids: Iterable[int]) -> Callable[[], Any]:
+    """Get the request made by a scenario.
+
+    Args:
+        name (str): ``get`` for `VGMdb.get` of albums, ``search`` for `VGMdb.search`, ``fetch`` for the albums of ``vgmdb fetch`` written as JSON Lines, ``crawl`` for the bulk requests of a crawl worker.
+        ids (Iterable[int]): The IDs to cycle through.
+
+    Returns:
+        Callable[[], Any]: Sends the next request.
+    """
+    from .cli import fetch_tasks
+    from .client import VGMdb
+    from .crawl import fetch_object
+
+    if name not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {name}")
+    next_id = itertools.cycle(ids).__next__
+    tasks = fetch_tasks(itertools.cycle(ids), VGMdbType.Album)
+    fetch = fetch_object(VGMdbType.Album)
+    lock = threading.Lock()
+
+    def request() -> Any:
+        if name == "fetch":
+            with lock:
+                _, task = next(tasks)
+            return [json.dumps(record, ensure_ascii=False) for record in task()]
+        with lock:
+            id = next_id()
+        if name == "search":
+            return VGMdb.search(f"query {id}", VGMdbType.Album)
+        if name == "crawl":
+            return fetch(id)
+        return VGMdb.get(id, VGMdbType.Album)
+
+    return request
+
+
+def client_version() -> dict[str, str | None]:
+    """Get the version of the installed client and the commit of its checkout.
+
+    Returns:
+        dict[str, str | None]: The version and the commit, None where unknown.
+    """
+    try:
+        version = importlib.metadata.version("vgmdb")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"version": version, "commit": commit}
+
+
+def run(
+    request: Callable[[], Any],
+    concurrency: int,
+    duration: float,
+    interval: float = 1.0,
+    server: StandInServer | None = None,
+) -> dict[str, Any]:
+    """Send requests from `concurrency` threads for `duration` seconds.
+
+    Args:
+        request (Callable[[], Any]): Sends one request.
+        concurrency (int): The number of threads.
+        duration (float): Seconds to run.
+        interval (float, optional): Seconds between samples of throughput and memory. Defaults to 1.
+        server (StandInServer | None, optional): The server, to count the connections opened. Defaults to None.
+
+    Returns:
+        dict[str, Any]: Requests, errors, requests per second, latency percentiles in seconds, connections opened and samples over time.
+    """
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+    connections = server.connections if server else 0
+    started = time.monotonic()
+    stop_at = started + duration
+
+    def worker() -> None:
+        while time.monotonic() < stop_at:
+            sent = time.perf_counter()
+            try:
+                request()
+            except Exception as e:
+                with lock:
+                    errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latency = time.perf_counter() - sent
+            with lock:
+                latencies.append(latency)
+
+    samples = []
+
+    def sample() -> None:
+        with lock:
+            done = len(latencies) + sum(errors.values())
+        samples.append(
+            {
+                "time": round(time.monotonic() - started, 3),
+                "requests": done,
+                "rss": rss(),
+            }
+        )
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    sample()
+    for thread in threads:
+        thread.start()
+    next_sample = started
+    while any(thread.is_alive() for thread in threads):
+        next_sample += interval
+        for thread in threads:
+            thread.join(max(next_sample - time.monotonic(), 0))
+        sample()
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "duration": round(elapsed, 3),
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+        },
+        "connections": (server.connections - connections) if server else None,
+        "samples": samples,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the load test and write the report.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status.
+    """
+    from .cli import id_list, parse_ids
+
+    parser = argparse.ArgumentParser(
+        prog="python -m vgmdb.loadtest",
+        description="Load test the client against a local stand-in for VGMdb.",
+    )
+    parser.add_argument(
+        "--pages",
+        required=True,
+        help="directory of saved .html pages or a page archive to serve",
+    )
+    parser.add_argument(
+        "--search-page",
+        help="saved search results page to serve (default: search.html in --pages)",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="requests to send, may be repeated (default: get)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=id_list,
+        default="1,4,16",
+        help="comma separated numbers of concurrent clients (default: 1,4,16)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="seconds per scenario and concurrency (default: 10)",
+    )
+    parser.add_argument(
+        "--ids",
+        type=id_list,
+        default="1-1000",
+        help="album IDs to cycle through (default: 1-1000)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="seconds between samples of throughput and memory (default: 1)",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="server latency in seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random extra latency in seconds"
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        help="bytes per second per response (default: no limit)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="fraction of requests answered with 503 (default: 0)",
+    )
+    parser.add_argument("--seed", type=int, help="seed of the random jitter and errors")
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSON report file (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+    if args.search_page:
+        with open(args.search_page, "rb") as f:
+            search_page = f.read()
+    else:
+        search_page = load_search_page(args.pages)
+    if "search" in (args.scenario or []) and search_page is None:
+        parser.error("the search scenario needs a saved search page")
+
+    from .client import VGMdb
+
+    ids = list(parse_ids([args.ids]))
+    profile = Profile(
+        args.latency, args.jitter, args.bandwidth, args.error_rate, args.seed
+    )
+    report: dict[str, Any] = {
+        "client": client_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile": profile.to_dict(),
+        "runs": [],
+    }
+    base_url = VGMdb.base_url
+    with StandInServer(load_pages(args.pages), profile, search_page) as server:
+        VGMdb.set_base_url(server.url)
+        try:
+            for name in args.scenario or ["get"]:
+                for concurrency in parse_ids([args.concurrency]):
+                    result = run(
+                        scenario(name, ids),
+                        concurrency,
+                        args.duration,
+                        args.interval,
+                        server,
+                    )
+                    report["runs"].append({"scenario": name, **result})
+                    sys.stderr.write(
+                        f"{name} x{concurrency}: "
+                        f"{result['requests_per_second']:.1f} requests/s\n"
+                    )
+        finally:
+            VGMdb.set_base_url(base_url)
+    file = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,27 @@
-from .utils import VGMdbObject, VGMdbType, Name, Link
+from __future__ import annotations
 
-from lxml import etree
+from .utils import VGMdbObject, VGMdbType, Name, Link, Picture
+from .sections import Sections, set_details, split_names, text
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+    from .album import Album
 
 
 class Org(VGMdbObject):
     type: VGMdbType = VGMdbType.Org
     aliases: list[str] | None
 
+    # details
+    picture: Picture | None
+    region: str | None
+    info: dict[str, str]
+    notes: str
+    albums: list[Album]
+
     @staticmethod
     def from_table(element: etree._Element) -> "Org":
         link_element = element.xpath("./td/a")[0]
@@ -18,8 +33,17 @@ class Org(VGMdbObject):
         return org
 
     @staticmethod
-    def from_page(page) -> "Org":
-        return Org(-1)  # TODO
+    def from_page(page: etree._Element, sections: Sections | None = None) -> "Org":
+        sections = sections or Sections(page)
+        org = Org(Link.from_element(sections.link).id)
+        for label, value in set_details(org, sections).items():
+            if label in ("Aliases", "Alias", "Also Known As", "Former Names"):
+                org.aliases = (getattr(org, "aliases", None) or []) + split_names(
+                    text(value)
+                )
+            elif label == "Region":
+                org.region = text(value)
+        return org
 
     @staticmethod
     def from_element(element: etree._Element) -> "Org":
@@ -1,9 +1,17 @@
-from .utils import VGMdbObject, VGMdbType, Name, Link, parse_date
+from __future__ import annotations
+
+from .utils import VGMdbObject, VGMdbType, Name, Link, Picture, parse_date
+from .sections import Sections, set_details, text
 
 from enum import Enum
-from lxml import etree
+from typing import TYPE_CHECKING
 import datetime
 
+if TYPE_CHECKING:
+    from lxml import etree
+
+    from .album import Album
+
 
 class Product(VGMdbObject):
     class Category(Enum):
@@ -23,6 +31,12 @@ class Product(VGMdbObject):
     category: Category | None = None
     release_date: datetime.date | None = None
 
+    # details
+    picture: Picture | None
+    info: dict[str, str]
+    notes: str
+    albums: list[Album]
+
     @staticmethod
     def from_table(element: etree._Element) -> "Product":
         link_element = element.xpath("./td[1]/a")[0]
@@ -36,5 +50,13 @@ class Product(VGMdbObject):
         return product
 
     @staticmethod
-    def from_page(page) -> "Product":
-        return Product(-1)  # TODO
+    def from_page(page: etree._Element, sections: Sections | None = None) -> "Product":
+        sections = sections or Sections(page)
+        product = Product(Link.from_element(sections.link).id)
+        for label, value in set_details(product, sections).items():
+            if label == "Release Date":
+                try:
+                    product.release_date = parse_date(text(value))
+                except ValueError:
+                    product.release_date = None
+        return product
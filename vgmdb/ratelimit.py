@@ -0,0 +1,42 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how often requests are sent.
+
+    Args:
+        rate (float): Requests allowed per second, 0 or less for no limit.
+        burst (int, optional): Requests that may be sent back to back after an idle period. Defaults to 1.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is available.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while wait := self.try_acquire():
+            time.sleep(wait)
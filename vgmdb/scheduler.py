@@ -0,0 +1,193 @@
+from .deadline import Deadline, DeadlineExceeded
+from .ratelimit import RateLimiter
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+import collections
+import itertools
+import threading
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+_priority: ContextVar[str] = ContextVar("vgmdb_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Send the requests made in this context with the given request class.
+
+    Args:
+        name (str): The name of the request class, e.g. `BULK` for background crawls.
+    """
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Get the request class of the current context.
+
+    Returns:
+        str: The name of the request class, `INTERACTIVE` unless set with `priority`.
+    """
+    return _priority.get()
+
+
+class RequestClass:
+    """A class of requests sharing a priority, a weight and a concurrency cap.
+
+    Args:
+        name (str): The name of the class.
+        priority (int, optional): Lower values are served first; queued requests of a higher value wait as long as any lower one is queued. Defaults to 0.
+        weight (float, optional): Share of the requests sent among classes of the same priority. Defaults to 1.
+        concurrency (int | None, optional): Maximum requests of this class in flight, None for no limit. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        priority: int = 0,
+        weight: float = 1.0,
+        concurrency: int | None = None,
+    ) -> None:
+        self.name = name
+        self.priority = priority
+        self.weight = weight
+        self.concurrency = concurrency
+        self.queue: collections.deque[int] = collections.deque()
+        self.running = 0
+        self.sent = 0
+        # virtual time of stride scheduling, advanced by 1 / weight per request
+        self.pass_ = 0.0
+
+    def ready(self) -> bool:
+        return bool(self.queue) and (
+            self.concurrency is None or self.running < self.concurrency
+        )
+
+    def to_dict(self) -> dict[str, int]:
+        return {"queued": len(self.queue), "running": self.running, "sent": self.sent}
+
+
+class Scheduler:
+    """Orders requests of several classes under one shared rate limit.
+
+    The next request to be sent is taken from the ready class with the
+    lowest priority value, so interactive requests overtake queued bulk
+    work. Classes of equal priority share the rate in proportion to their
+    weights. A class at its concurrency cap is skipped until one of its
+    requests completes.
+
+    Args:
+        rate (float): Requests allowed per second across all classes, 0 or less for no limit.
+        burst (int, optional): Requests that may be sent back to back after an idle period. Defaults to 1.
+        classes (Iterable[RequestClass] | None, optional): The request classes. Defaults to `INTERACTIVE` at priority 0 and `BULK` at priority 1.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        classes: Iterable[RequestClass] | None = None,
+    ) -> None:
+        if classes is None:
+            classes = [RequestClass(INTERACTIVE, 0), RequestClass(BULK, 1)]
+        self.classes = {i.name: i for i in classes}
+        self.limiter = RateLimiter(rate, burst)
+        self.condition = threading.Condition()
+        self.tickets = itertools.count()
+
+    def _next(self) -> RequestClass | None:
+        ready = [i for i in self.classes.values() if i.ready()]
+        return min(ready, key=lambda i: (i.priority, i.pass_), default=None)
+
+    def acquire(self, name: str, deadline: Deadline | None = None) -> None:
+        """Wait until a request of the class may be sent.
+
+        Every call has to be followed by `release` once the response is read.
+
+        Args:
+            name (str): The name of the request class.
+            deadline (Deadline | None, optional): Deadline for waiting. Defaults to None.
+
+        Raises:
+            KeyError: If there is no class with the name.
+            DeadlineExceeded: If the deadline passes while waiting.
+        """
+        deadline = deadline or Deadline(None)
+        request_class = self.classes[name]
+        with self.condition:
+            ticket = next(self.tickets)
+            if not request_class.queue:
+                # a class returning from idle must not catch up on its lost share
+                active = [
+                    i.pass_
+                    for i in self.classes.values()
+                    if i.queue and i.priority == request_class.priority
+                ]
+                if active:
+                    request_class.pass_ = max(request_class.pass_, min(active))
+            request_class.queue.append(ticket)
+            self.condition.notify_all()
+            try:
+                while True:
+                    wait = None
+                    if (
+                        self._next() is request_class
+                        and request_class.queue[0] == ticket
+                    ):
+                        if not (wait := self.limiter.try_acquire()):
+                            break
+                    remaining = deadline.remaining()
+                    if remaining == 0.0:
+                        raise DeadlineExceeded(
+                            f"Deadline of {deadline.timeout}s exceeded"
+                        )
+                    timeouts = [i for i in (wait, remaining) if i is not None]
+                    self.condition.wait(min(timeouts, default=None))
+            except BaseException:
+                request_class.queue.remove(ticket)
+                self.condition.notify_all()
+                raise
+            request_class.queue.popleft()
+            request_class.running += 1
+            request_class.sent += 1
+            request_class.pass_ += 1 / request_class.weight
+            self.condition.notify_all()
+
+    def release(self, name: str) -> None:
+        """Mark a request of the class as complete.
+
+        Args:
+            name (str): The name of the request class.
+        """
+        with self.condition:
+            self.classes[name].running -= 1
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, name: str, deadline: Deadline | None = None) -> Iterator[None]:
+        """Hold a slot of the class while sending a request.
+
+        Args:
+            name (str): The name of the request class.
+            deadline (Deadline | None, optional): Deadline for waiting. Defaults to None.
+        """
+        self.acquire(name, deadline)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Get the queued, running and sent requests per class.
+
+        Returns:
+            dict[str, dict[str, int]]: The counters by class name.
+        """
+        with self.condition:
+            return {name: i.to_dict() for name, i in self.classes.items()}
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from .utils import VGMdbObject, Name, Picture
+
+from typing import TYPE_CHECKING, Iterator
+import re
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+
+class Sections:
+    """The section roots of a VGMdb page, collected in a single walk of the tree.
+
+    Detail parsers look their sections up here instead of running a
+    document-wide XPath query for each of them.
+
+    Args:
+        page (etree._Element): The parsed page.
+    """
+
+    # Only these tags are handed back to Python, the rest of the walk
+    # happens inside libxml2.
+    TAGS = ("div", "table", "span", "h1", "h3", "link", "meta")
+
+    def __init__(self, page: etree._Element) -> None:
+        self.ids: dict[str, etree._Element] = {}
+        self.headings: dict[str, etree._Element] = {}
+        self.meta: dict[str, str] = {}
+        self.link: etree._Element | None = None
+        self.h1: etree._Element | None = None
+        self.title: etree._Element | None = None
+        for element in page.iter(*self.TAGS):
+            tag = element.tag
+            if id := element.get("id"):
+                self.ids.setdefault(id, element)
+            if tag == "h1":
+                if self.h1 is None:
+                    self.h1 = element
+                if self.title is None and element.getparent().get("id") == "innermain":
+                    self.title = element
+            elif tag == "h3":
+                if element.text:
+                    self.headings.setdefault(element.text, element)
+            elif tag == "meta":
+                if property := element.get("property"):
+                    self.meta.setdefault(property, element.get("content"))
+            elif tag == "link":
+                if self.link is None and element.getparent().tag == "head":
+                    self.link = element
+
+    def get(self, id: str) -> etree._Element | None:
+        """Get the element with the given id.
+
+        Args:
+            id (str): The id attribute.
+
+        Returns:
+            etree._Element | None: The element if found, None otherwise.
+        """
+        return self.ids.get(id)
+
+    def find(self, id: str, tag: str) -> etree._Element | None:
+        """Get the first descendant with the given tag of the element with the given id.
+
+        Args:
+            id (str): The id attribute of the section.
+            tag (str): The tag to look for.
+
+        Returns:
+            etree._Element | None: The element if found, None otherwise.
+        """
+        if (section := self.ids.get(id)) is None:
+            return None
+        return next(section.iterdescendants(tag), None)
+
+    def heading(self, text: str) -> etree._Element | None:
+        """Get the content box following the box titled with an ``h3`` heading.
+
+        Args:
+            text (str): The text of the heading.
+
+        Returns:
+            etree._Element | None: The first ``div`` after the heading's box if found, None otherwise.
+        """
+        if (h3 := self.headings.get(text)) is None:
+            return None
+        if (box := h3.getparent()) is None or (box := box.getparent()) is None:
+            return None
+        return next(box.itersiblings("div"), None)
+
+    def is_error(self) -> bool:
+        """Whether the page is a "System Message" page, e.g. for a missing ID.
+
+        Returns:
+            bool: True if the page is an error page.
+        """
+        return self.h1 is not None and self.h1.text == "System Message"
+
+
+def info_rows(element: etree._Element) -> Iterator[tuple[str, etree._Element]]:
+    """Iterate over the label and value pairs of an info table or list.
+
+    Handles both two-column table rows and ``dt``/``dd`` pairs.
+
+    Args:
+        element (etree._Element): The table, list or a section containing them.
+
+    Yields:
+        tuple[str, etree._Element]: The label, without trailing colon, and the value element.
+    """
+    for row in element.iter("tr", "dt"):
+        if row.tag == "tr":
+            cells = row.findall("td")
+            if len(cells) < 2:
+                continue
+            label, value = cells[0], cells[1]
+        else:
+            value = row.getnext()
+            if value is None or value.tag != "dd":
+                continue
+            label = row
+        label_text = "".join(label.itertext()).strip().rstrip(":").strip()
+        if label_text:
+            yield label_text, value
+
+
+def text(element: etree._Element) -> str:
+    """Get the whitespace-normalized text content of an element.
+
+    Args:
+        element (etree._Element): The element.
+
+    Returns:
+        str: The text content.
+    """
+    return " ".join("".join(element.itertext()).split())
+
+
+def set_details(obj: VGMdbObject, sections: Sections) -> dict[str, etree._Element]:
+    """Set the parts shared by artist, organization, product and event pages.
+
+    Sets ``name``, ``picture``, ``info`` (label to text), ``notes`` and
+    ``albums`` (every album linked from the main column).
+
+    Args:
+        obj (VGMdbObject): The object to fill in.
+        sections (Sections): The sections of the object's page.
+
+    Returns:
+        dict[str, etree._Element]: The info rows, label to value element.
+    """
+    from .album import Album
+
+    if sections.title is not None:
+        obj.name = Name.from_element(sections.title)
+    obj.picture = None
+    if url := sections.meta.get("og:image"):
+        try:
+            obj.picture = Picture.from_url(url)
+        except ValueError:
+            pass  # the site logo when there is no picture
+    rows: dict[str, etree._Element] = {}
+    for id in ("leftfloat", "rightfloat"):
+        if (section := sections.get(id)) is None:
+            continue
+        if (info := next(section.iterdescendants("dl", "table"), None)) is not None:
+            rows = dict(info_rows(info))
+            break
+    obj.info = {label: text(value) for label, value in rows.items()}
+    if (notes := sections.get("notes")) is not None:
+        obj.notes = "\n".join(notes.xpath(".//text()")).strip()
+    obj.albums = []
+    if (main := sections.get("innermain")) is not None:
+        seen = set()
+        for element in main.iter("a"):
+            if m := re.search(r"(?:^|/)album/(\d+)", element.get("href", "")):
+                if m.group(1) not in seen:
+                    seen.add(m.group(1))
+                    obj.albums.append(Album.from_element(element))
+    return rows
+
+
+def split_names(value: str) -> list[str]:
+    """Split a list of names separated by commas or slashes.
+
+    Args:
+        value (str): The names.
+
+    Returns:
+        list[str]: The stripped, non-empty names.
+    """
+    return [i.strip() for i in re.split(r"[,/]", value) if i.strip()]
@@ -0,0 +1,133 @@
+from .deadline import DeadlineExceeded
+
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+import asyncio
+import copy
+import threading
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function, callers arriving while it
+    is in flight wait for it and share its result. Every caller gets its own
+    deep copy, so mutating a result never affects another caller.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(
+        self, key: Hashable, function: Callable[[], T], timeout: float | None = None
+    ) -> T:
+        """Run a function, or join the in-flight call with the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            function (Callable[[], T]): The function to run.
+            timeout (float | None, optional): Seconds to wait when joining an in-flight call. Defaults to None.
+
+        Raises:
+            DeadlineExceeded: If the joined call does not complete in time.
+
+        Returns:
+            T: A private copy of the function's result.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+        if leader:
+            try:
+                call.result = function()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call.done.set()
+        elif not call.done.wait(timeout):
+            raise DeadlineExceeded(f"Deadline of {timeout}s exceeded")
+        if call.error is not None:
+            raise call.error
+        if leader and call.waiters == 0:
+            return call.result
+        return copy.deepcopy(call.result)
+
+
+class _AsyncCall:
+    def __init__(self, task: asyncio.Future) -> None:
+        self.task = task
+        self.callers = 0
+        self.shared = False
+
+
+class AsyncSingleFlight(Generic[T]):
+    """Coalesces concurrent coroutines with the same key into one execution.
+
+    The asyncio counterpart of `SingleFlight`, sharing results between
+    tasks of one event loop. The shared call runs as a task of its own, so
+    cancelling one caller never cancels the others; the call is only
+    cancelled once every caller has been cancelled.
+    """
+
+    def __init__(self) -> None:
+        self.calls: dict[tuple[asyncio.AbstractEventLoop, Hashable], _AsyncCall] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """Await a coroutine function, or join the in-flight call with the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            function (Callable[[], Awaitable[T]]): The coroutine function to run.
+
+        Returns:
+            T: A private copy of the result.
+        """
+        loop = asyncio.get_running_loop()
+        if call := self.calls.get((loop, key)):
+            self.shared += 1
+            call.shared = True
+        else:
+            call = self.calls[(loop, key)] = _AsyncCall(
+                asyncio.ensure_future(function())
+            )
+            self.executed += 1
+
+            def done(task: asyncio.Future, call: _AsyncCall = call) -> None:
+                if self.calls.get((loop, key)) is call:
+                    del self.calls[(loop, key)]
+
+            call.task.add_done_callback(done)
+        call.callers += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.callers == 1:
+                call.task.cancel()
+            raise
+        finally:
+            call.callers -= 1
+        if not call.shared:
+            return result
+        return copy.deepcopy(result)
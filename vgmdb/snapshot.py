@@ -0,0 +1,188 @@
+from .utils import VGMdbObject, VGMdbType
+
+from typing import Iterable, Iterator
+import mmap
+import os
+import pickle
+import struct
+
+MAGIC = b"VGMDBSN1"
+# index offset, number of records, magic
+FOOTER = struct.Struct("<QQ8s")
+# key (type << 32 | id), offset and length of a record, sorted by key
+ENTRY = struct.Struct("<QQI")
+MAX_ID = 0xFFFFFFFF
+
+
+def _key(type: VGMdbType, id: int) -> int:
+    return type.value << 32 | id
+
+
+def write_snapshot(objects: Iterable[VGMdbObject], path: str | os.PathLike) -> int:
+    """Write parsed objects to a snapshot file.
+
+    The snapshot is written to a temporary file and moved into place, so
+    open snapshots keep reading the previous file until they are reloaded.
+    A later object with the same type and ID replaces an earlier one.
+
+    Args:
+        objects (Iterable[VGMdbObject]): The objects.
+        path (str | os.PathLike): The snapshot file.
+
+    Returns:
+        int: The number of objects in the snapshot.
+
+    Raises:
+        ValueError: If an object has no ID, e.g. an unlinked artist, or an ID that does not fit in the index.
+    """
+    path = os.fspath(path)
+    index: dict[int, tuple[int, int]] = {}
+    try:
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(MAGIC)
+            for obj in objects:
+                if not 0 <= obj.id <= MAX_ID:
+                    raise ValueError(f"Cannot store {obj.type.name} with ID {obj.id}")
+                record = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+                index[_key(obj.type, obj.id)] = (f.tell(), len(record))
+                f.write(record)
+            index_offset = f.tell()
+            for key in sorted(index):
+                f.write(ENTRY.pack(key, *index[key]))
+            f.write(FOOTER.pack(index_offset, len(index), MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{path}.tmp", path)
+    except BaseException:
+        try:
+            os.remove(f"{path}.tmp")
+        except FileNotFoundError:
+            pass
+        raise
+    return len(index)
+
+
+class Snapshot:
+    """Read-only, memory-mapped access to the objects of a snapshot file.
+
+    Processes that open the same snapshot share one copy of it in the page
+    cache. The index is searched in place and only the requested record is
+    unpickled, so an open snapshot costs next to no private memory. Records
+    are pickles, only open snapshots you wrote yourself.
+
+    Args:
+        path (str | os.PathLike): The snapshot file.
+
+    Raises:
+        ValueError: If the file is not a snapshot.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = os.fspath(path)
+        # the map and the position and length of its index, swapped as one
+        # by `reload` so that concurrent lookups see a consistent snapshot
+        self.current: tuple[mmap.mmap, int, int] | None = None
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size < len(MAGIC) + FOOTER.size:
+                raise ValueError(f"Not a snapshot: {self.path}")
+            map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if (
+            len(map) < len(MAGIC) + FOOTER.size
+            or map[: len(MAGIC)] != MAGIC
+            or map[-len(MAGIC) :] != MAGIC
+        ):
+            map.close()
+            raise ValueError(f"Not a snapshot: {self.path}")
+        index_offset, count, _ = FOOTER.unpack_from(map, len(map) - FOOTER.size)
+        # set only once the file is valid, so a bad file is tried again by
+        # the next `reload`; a previous map is unmapped once no thread reads
+        # from it anymore
+        self.inode, self.current = stat.st_ino, (map, index_offset, count)
+
+    def reload(self) -> bool:
+        """Switch to the current file if the snapshot was rebuilt.
+
+        Returns:
+            bool: True if a new snapshot was mapped.
+        """
+        if os.stat(self.path).st_ino == self.inode:
+            return False
+        self._open()
+        return True
+
+    def _current(self) -> tuple[mmap.mmap, int, int]:
+        if (current := self.current) is None:
+            raise ValueError(f"Snapshot is closed: {self.path}")
+        return current
+
+    @staticmethod
+    def _find(current: tuple[mmap.mmap, int, int], key: int) -> tuple[int, int] | None:
+        map, index_offset, count = current
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            entry, offset, length = ENTRY.unpack_from(
+                map, index_offset + middle * ENTRY.size
+            )
+            if entry < key:
+                low = middle + 1
+            elif entry > key:
+                high = middle
+            else:
+                return offset, length
+        return None
+
+    def get(self, type: VGMdbType, id: int) -> VGMdbObject | None:
+        """Get an object.
+
+        Every call returns a new copy of the object.
+
+        Args:
+            type (VGMdbType): Type of the object.
+            id (int): ID of the object.
+
+        Returns:
+            VGMdbObject | None: The object if in the snapshot, None otherwise.
+
+        Raises:
+            ValueError: If the snapshot is closed.
+        """
+        current = self._current()
+        if (entry := self._find(current, _key(type, id))) is None:
+            return None
+        offset, length = entry
+        with memoryview(current[0])[offset : offset + length] as record:
+            return pickle.loads(record)
+
+    def keys(self) -> Iterator[tuple[VGMdbType, int]]:
+        """Iterate over the types and IDs of the objects, in order.
+
+        Yields:
+            tuple[VGMdbType, int]: The type and ID of an object.
+        """
+        map, index_offset, count = self._current()
+        for key, _, _ in ENTRY.iter_unpack(
+            map[index_offset : index_offset + count * ENTRY.size]
+        ):
+            yield VGMdbType(key >> 32), key & 0xFFFFFFFF
+
+    def __contains__(self, key: tuple[VGMdbType, int]) -> bool:
+        return self._find(self._current(), _key(*key)) is not None
+
+    def __len__(self) -> int:
+        return self._current()[2]
+
+    def close(self) -> None:
+        if self.current is not None:
+            self.current[0].close()
+            self.current = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
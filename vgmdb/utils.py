@@ -1,10 +1,13 @@
+from __future__ import annotations
+
 from enum import Enum
 import re
 from abc import ABC
-from lxml import etree
+from typing import TYPE_CHECKING, Any
 import datetime
 
-import vgmdb
+if TYPE_CHECKING:
+    from lxml import etree
 
 
 class VGMdbType(Enum):
@@ -47,13 +50,13 @@ class Name:
     @staticmethod
     def from_element(element: etree._Element) -> "Name":
         name = Name()
-        if en := element.xpath('./span[@lang="en"]/text()'):
+        if en := element.xpath('./span[@lang="en"]/text()', smart_strings=False):
             name.en = en[0]
-        elif en := element.xpath("./text()"):
+        elif en := element.xpath("./text()", smart_strings=False):
             name.en = en[0]
-        if ja := element.xpath('./span[@lang="ja"]/text()'):
+        if ja := element.xpath('./span[@lang="ja"]/text()', smart_strings=False):
             name.ja = ja[0]
-        if ja_latn := element.xpath('./span[@lang="ja-Latn"]/text()'):
+        if ja_latn := element.xpath('./span[@lang="ja-Latn"]/text()', smart_strings=False):
             name.ja_latn = ja_latn[0]
         return name
 
@@ -95,7 +98,7 @@ class Link:
             raise ValueError("Invalid element")
 
     def full_url(self) -> str:
-        return f"https://vgmdb.net/{self:s}"
+        return f"https://vgmdb.net/{self}"
 
 
 class Picture:
@@ -190,10 +193,24 @@ class VGMdbObject(ABC):
         return self.name.en or self.name.ja or self.name.ja_latn or ""
     
     def get_detail(self) -> "VGMdbObject":
-        new_object = vgmdb.VGMdb.get(self.id, self.type)
+        from .client import VGMdb
+
+        new_object = VGMdb.get(self.id, self.type)
         self.__dict__.update(new_object.__dict__)
         return self
 
+    def to_dict(self) -> dict:
+        """Convert the object to JSON-compatible data.
+
+        Returns:
+            dict: The object's attributes, with nested values converted by `to_dict`.
+        """
+        result = {"type": str(self.type), "id": self.id}
+        for key, value in vars(self).items():
+            if key not in ("type", "id", "link"):
+                result[key] = to_dict(value)
+        return result
+
 
 def parse_date(date: str) -> datetime.date | None:
     formats = ["%b %d, %Y", "%b %Y", "%Y"]
@@ -214,3 +231,38 @@ def parse_time(time: str) -> datetime.timedelta | None:
         return datetime.timedelta(seconds=t)
     except ValueError:
         raise (ValueError(f"Invalid time: {time}"))
+
+
+def to_dict(value: Any) -> Any:
+    """Convert a parsed value to JSON-compatible data.
+
+    Names become dicts, links and pictures become URLs, dates become ISO
+    strings, durations become seconds and enums become their names.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: The converted value.
+    """
+    if isinstance(value, VGMdbObject):
+        return value.to_dict()
+    elif isinstance(value, Name):
+        return {"en": value.en, "ja": value.ja, "ja_latn": value.ja_latn}
+    elif isinstance(value, (Link, Picture)):
+        return value.full_url()
+    elif isinstance(value, Enum):
+        return value.name
+    elif isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    elif isinstance(value, datetime.timedelta):
+        return int(value.total_seconds())
+    elif isinstance(value, str):
+        return str(value)
+    elif isinstance(value, (list, tuple)):
+        return [to_dict(i) for i in value]
+    elif isinstance(value, dict):
+        return {str(k): to_dict(v) for k, v in value.items()}
+    elif isinstance(value, (Track, Tracklist)):
+        return {k: to_dict(v) for k, v in vars(value).items()}
+    return value